@@ -4,6 +4,7 @@ All sensitive data should be stored in environment variables.
 """
 import os
 from pathlib import Path
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -30,7 +31,7 @@ LOG_FILE = LOG_DIR / 'scanner.log'
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 
 # Rate Limits (requests per hour)
-MAX_REQUESTS_PER_HOUR = {
+MAX_REQUESTS_PER_HOUR = MappingProxyType({
     'amazon': 50,
     'bestbuy': 100,
     'walmart': 80,
@@ -38,7 +39,7 @@ MAX_REQUESTS_PER_HOUR = {
     'rapidapi': 500,  # Monthly limit / 30 days / 24 hours ≈ 0.7/hour (conservative)
     'serpapi': 100,   # Monthly limit / 30 days / 24 hours ≈ 0.14/hour
     'rainforest': 100, # Monthly limit / 30 days / 24 hours ≈ 0.14/hour
-}
+})
 
 # Scraping Configuration
 SCRAPING_CONFIG = {
@@ -33,6 +33,7 @@ class AmazonScraper:
         self.search_url = RETAILERS['amazon']['search_url']
         self.api_config = API_ENDPOINTS.get('rapidapi', {})
         self.driver = None
+        self.throttle_handle = scraper_throttler.handle('amazon')
 
     def search_products_api(self, keywords: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """
@@ -181,7 +182,7 @@ class AmazonScraper:
             logger.warning("Amazon rate limit exceeded")
             return []
 
-        scraper_throttler.throttle('amazon')
+        self.throttle_handle.throttle()
 
         try:
             driver = self._get_driver()
@@ -226,7 +227,7 @@ class AmazonScraper:
             logger.warning("Amazon rate limit exceeded")
             return None
 
-        scraper_throttler.throttle('amazon')
+        self.throttle_handle.throttle()
 
         try:
             driver = self._get_driver()
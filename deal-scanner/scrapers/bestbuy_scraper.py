@@ -32,6 +32,7 @@ class BestBuyScraper:
         self.top_deals_url = RETAILERS['bestbuy']['top_deals_url']
         self.deal_of_day_url = RETAILERS['bestbuy']['deal_of_day_url']
         self.driver = None
+        self.throttle_handle = scraper_throttler.handle('bestbuy')
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def get_top_deals(self, max_results: int = 20) -> List[Dict[str, Any]]:
@@ -48,7 +49,7 @@ class BestBuyScraper:
             logger.warning("Best Buy rate limit exceeded")
             return []
 
-        scraper_throttler.throttle('bestbuy')
+        self.throttle_handle.throttle()
 
         try:
             driver = self._get_driver()
@@ -92,7 +93,7 @@ class BestBuyScraper:
             logger.warning("Best Buy rate limit exceeded")
             return []
 
-        scraper_throttler.throttle('bestbuy')
+        self.throttle_handle.throttle()
 
         try:
             driver = self._get_driver()
@@ -129,7 +130,7 @@ class BestBuyScraper:
             logger.warning("Best Buy rate limit exceeded")
             return []
 
-        scraper_throttler.throttle('bestbuy')
+        self.throttle_handle.throttle()
 
         try:
             driver = self._get_driver()
@@ -173,7 +174,7 @@ class BestBuyScraper:
             logger.warning("Best Buy rate limit exceeded")
             return None
 
-        scraper_throttler.throttle('bestbuy')
+        self.throttle_handle.throttle()
 
         try:
             driver = self._get_driver()
@@ -32,6 +32,7 @@ class WalmartScraper:
         self.base_url = RETAILERS['walmart']['base_url']
         self.search_url = RETAILERS['walmart']['search_url']
         self.driver = None
+        self.throttle_handle = scraper_throttler.handle('walmart')
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def search_products(self, keywords: str, max_results: int = 10) -> List[Dict[str, Any]]:
@@ -49,7 +50,7 @@ class WalmartScraper:
             logger.warning("Walmart rate limit exceeded")
             return []
 
-        scraper_throttler.throttle('walmart')
+        self.throttle_handle.throttle()
 
         try:
             driver = self._get_driver()
@@ -100,7 +101,7 @@ class WalmartScraper:
             logger.warning("Walmart rate limit exceeded")
             return []
 
-        scraper_throttler.throttle('walmart')
+        self.throttle_handle.throttle()
 
         try:
             driver = self._get_driver()
@@ -144,7 +145,7 @@ class WalmartScraper:
             logger.warning("Walmart rate limit exceeded")
             return None
 
-        scraper_throttler.throttle('walmart')
+        self.throttle_handle.throttle()
 
         try:
             driver = self._get_driver()
@@ -3,16 +3,64 @@ User agent rotation and request header management.
 Helps avoid detection when scraping websites.
 """
 import random
-from typing import Dict, List
+from collections import deque
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, List, Optional, Set
+import numpy as np
 from fake_useragent import UserAgent
 from loguru import logger
 
 from config.settings import SCRAPING_CONFIG
 
 
+# Playwright context options shared by every launch; the user agent is
+# stamped onto a shallow copy per call, so treat nested values as read-only
+_PLAYWRIGHT_CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'locale': 'en-US',
+    'timezone_id': 'America/New_York',
+    'permissions': [],
+    'geolocation': {'longitude': -74.0060, 'latitude': 40.7128},  # New York
+    'extra_http_headers': {
+        'Accept-Language': 'en-US,en;q=0.9',
+    }
+}
+
+
+@lru_cache(maxsize=1)
+def _shared_ua() -> Optional[UserAgent]:
+    """Build the fake-useragent generator once per process, on first use."""
+    try:
+        return UserAgent()
+    except Exception as e:
+        logger.warning(f"Could not initialize UserAgent library: {e}")
+        return None
+
+
 class UserAgentRotator:
     """Rotate user agents to avoid detection."""
 
+    # Static Chrome flags; only the user agent changes per launch
+    _SELENIUM_BASE = (
+        '--disable-blink-features=AutomationControlled',
+        '--disable-dev-shm-usage',
+        '--disable-gpu',
+        '--no-sandbox',
+        '--disable-setuid-sandbox',
+        '--disable-web-security',
+        '--disable-features=IsolateOrigins,site-per-process',
+        '--window-size=1920,1080',
+        '--disable-infobars',
+        '--disable-notifications',
+        '--disable-popup-blocking',
+        '--start-maximized',
+    )
+    _SELENIUM_HEADLESS_EXTRA = (
+        '--headless=new',
+        '--disable-extensions',
+    )
+
     def __init__(self, custom_agents: List[str] = None):
         """
         Initialize user agent rotator.
@@ -21,17 +69,19 @@ class UserAgentRotator:
             custom_agents: Optional list of custom user agents
         """
         self.custom_agents = custom_agents or SCRAPING_CONFIG['user_agents']
-        try:
-            self.ua_generator = UserAgent()
-        except Exception as e:
-            logger.warning(f"Could not initialize UserAgent library: {e}")
-            self.ua_generator = None
+        self._n_agents = len(self.custom_agents)
+        self._rng = random.Random()
+
+    @property
+    def ua_generator(self) -> Optional[UserAgent]:
+        """Process-wide fake-useragent instance, loaded lazily."""
+        return _shared_ua()
 
     def get_random_user_agent(self) -> str:
         """Get a random user agent string."""
         # Prefer custom agents list
-        if self.custom_agents:
-            return random.choice(self.custom_agents)
+        if self._n_agents:
+            return self.custom_agents[int(self._rng.random() * self._n_agents)]
 
         # Fallback to fake-useragent library
         if self.ua_generator:
@@ -138,43 +188,19 @@ class UserAgentRotator:
         Returns:
             List of Chrome options
         """
-        options = [
-            '--disable-blink-features=AutomationControlled',
-            '--disable-dev-shm-usage',
-            '--disable-gpu',
-            '--no-sandbox',
-            '--disable-setuid-sandbox',
-            '--disable-web-security',
-            '--disable-features=IsolateOrigins,site-per-process',
-            '--window-size=1920,1080',
-            f'--user-agent={self.get_random_user_agent()}',
-            '--disable-infobars',
-            '--disable-notifications',
-            '--disable-popup-blocking',
-            '--start-maximized',
-        ]
+        options = list(self._SELENIUM_BASE)
+        options.append(f'--user-agent={self.get_random_user_agent()}')
 
         if headless:
-            options.extend([
-                '--headless=new',
-                '--disable-extensions',
-            ])
+            options.extend(self._SELENIUM_HEADLESS_EXTRA)
 
         return options
 
     def get_playwright_context_options(self) -> Dict:
         """Get Playwright context options for anti-detection."""
-        return {
-            'user_agent': self.get_random_user_agent(),
-            'viewport': {'width': 1920, 'height': 1080},
-            'locale': 'en-US',
-            'timezone_id': 'America/New_York',
-            'permissions': [],
-            'geolocation': {'longitude': -74.0060, 'latitude': 40.7128},  # New York
-            'extra_http_headers': {
-                'Accept-Language': 'en-US,en;q=0.9',
-            }
-        }
+        options = _PLAYWRIGHT_CONTEXT_OPTIONS.copy()
+        options['user_agent'] = self.get_random_user_agent()
+        return options
 
 
 class ProxyRotator:
@@ -190,15 +216,16 @@ class ProxyRotator:
         Args:
             proxies: List of proxy URLs
         """
-        self.proxies = proxies or []
-        self.current_index = 0
+        self.proxies = deque(dict.fromkeys(proxies or []))
+        self._proxy_set: Set[str] = set(self.proxies)
+        self._rng = random.Random()
 
     def get_random_proxy(self) -> Dict[str, str]:
         """Get a random proxy configuration."""
         if not self.proxies:
             return {}
 
-        proxy = random.choice(self.proxies)
+        proxy = self.proxies[int(self._rng.random() * len(self.proxies))]
         return {
             'http': proxy,
             'https': proxy,
@@ -209,8 +236,8 @@ class ProxyRotator:
         if not self.proxies:
             return {}
 
-        proxy = self.proxies[self.current_index]
-        self.current_index = (self.current_index + 1) % len(self.proxies)
+        proxy = self.proxies[0]
+        self.proxies.rotate(-1)
 
         return {
             'http': proxy,
@@ -219,13 +246,15 @@ class ProxyRotator:
 
     def add_proxy(self, proxy: str):
         """Add a proxy to the rotation."""
-        if proxy not in self.proxies:
+        if proxy not in self._proxy_set:
+            self._proxy_set.add(proxy)
             self.proxies.append(proxy)
             logger.info(f"Added proxy: {proxy}")
 
     def remove_proxy(self, proxy: str):
         """Remove a proxy from rotation."""
-        if proxy in self.proxies:
+        if proxy in self._proxy_set:
+            self._proxy_set.discard(proxy)
             self.proxies.remove(proxy)
             logger.info(f"Removed proxy: {proxy}")
 
@@ -235,6 +264,26 @@ ua_rotator = UserAgentRotator()
 proxy_rotator = ProxyRotator()
 
 
+# Unit-interval random numbers drawn in NumPy batches for get_random_delay
+_UNIT_BATCH_SIZE = 1024
+_rng = np.random.default_rng()
+_unit_buf = np.empty(0)
+_unit_idx = 0
+_unit_lock = Lock()
+
+
+def _next_unit_random() -> float:
+    """Pop the next uniform [0, 1) value, refilling the batch when it runs out."""
+    global _unit_buf, _unit_idx
+    with _unit_lock:
+        if _unit_idx >= len(_unit_buf):
+            _unit_buf = _rng.random(_UNIT_BATCH_SIZE)
+            _unit_idx = 0
+        value = _unit_buf[_unit_idx]
+        _unit_idx += 1
+    return float(value)
+
+
 def get_random_delay(min_delay: float = None, max_delay: float = None) -> float:
     """
     Get a random delay time for scraping.
@@ -248,4 +297,4 @@ def get_random_delay(min_delay: float = None, max_delay: float = None) -> float:
     """
     min_delay = min_delay or SCRAPING_CONFIG['delays']['min']
     max_delay = max_delay or SCRAPING_CONFIG['delays']['max']
-    return random.uniform(min_delay, max_delay)
+    return min_delay + (max_delay - min_delay) * _next_unit_random()
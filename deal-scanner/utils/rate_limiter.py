@@ -3,28 +3,66 @@ Rate limiter to ensure we stay within API and scraping limits.
 Implements token bucket algorithm and tracks usage in database.
 """
 import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, Optional
-from threading import Lock
+from typing import Dict, Optional, Tuple
+from threading import Condition, Lock
+import numpy as np
 from loguru import logger
 
 from config.settings import MAX_REQUESTS_PER_HOUR
 from utils.database import db
 
 
+# Number of delays drawn per NumPy batch in RequestThrottler
+_DELAY_BATCH_SIZE = 1024
+_rng = np.random.default_rng()
+
+# Seconds a RateLimiter.get_statistics entry may be reused
+STATS_CACHE_TTL = 1.0
+
+
+class TokenReservation:
+    """Tokens handed out by RateLimiter.reserve and how many were consumed."""
+
+    def __init__(self, granted: int):
+        self.granted = granted
+        self.used = 0
+
+    @property
+    def remaining(self) -> int:
+        """Tokens still available in this reservation."""
+        return self.granted - self.used
+
+    def use(self, n: int = 1) -> bool:
+        """Consume tokens from the reservation. Returns False if not enough remain."""
+        if self.used + n > self.granted:
+            return False
+        self.used += n
+        return True
+
+
 class RateLimiter:
     """Rate limiter using token bucket algorithm with database tracking."""
 
     def __init__(self):
         """Initialize rate limiter."""
-        self.locks: Dict[str, Lock] = {}
+        self.locks: Dict[str, Condition] = {}
         self.buckets: Dict[str, Dict] = {}
+        self._stats_cache: Dict[str, Tuple[float, Dict]] = {}
+
+    def _get_lock(self, api_name: str) -> Condition:
+        """
+        Get or create the lock for an API.
 
-    def _get_lock(self, api_name: str) -> Lock:
-        """Get or create a lock for an API."""
-        if api_name not in self.locks:
-            self.locks[api_name] = Lock()
-        return self.locks[api_name]
+        The lock is a Condition so waiters can block on it without holding
+        it. Never call time.sleep while holding one of these locks; use
+        Condition.wait, which releases it for the duration of the wait.
+        """
+        lock = self.locks.get(api_name)
+        if lock is None:
+            lock = self.locks.setdefault(api_name, Condition(Lock()))
+        return lock
 
     def _get_bucket(self, api_name: str) -> Dict:
         """Get or create a token bucket for an API."""
@@ -67,29 +105,39 @@ class RateLimiter:
         Returns:
             True if token acquired, False if timeout
         """
+        return self._take_tokens(api_name, 1, timeout)
+
+    def _take_tokens(self, api_name: str, n: int, timeout: Optional[float]) -> bool:
+        """Block until n tokens can be taken from the bucket, or time out."""
         lock = self._get_lock(api_name)
-        start_time = time.time()
+        deadline = None if timeout is None else time.monotonic() + timeout
 
-        while True:
-            with lock:
+        with lock:
+            while True:
                 bucket = self._get_bucket(api_name)
                 self._refill_bucket(bucket)
 
-                if bucket['tokens'] >= 1:
-                    bucket['tokens'] -= 1
+                if bucket['tokens'] >= n:
+                    bucket['tokens'] -= n
+                    self._stats_cache.pop(api_name, None)
                     logger.debug(
-                        f"Token acquired for {api_name}. "
+                        f"{n} token(s) acquired for {api_name}. "
                         f"Remaining: {bucket['tokens']:.2f}/{bucket['max_tokens']}"
                     )
                     return True
 
-            # Check timeout
-            if timeout and (time.time() - start_time) >= timeout:
-                logger.warning(f"Timeout waiting for rate limit token: {api_name}")
-                return False
+                # Time until the bucket refills enough on its own
+                wait = (n - bucket['tokens']) / bucket['refill_rate']
+
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        logger.warning(f"Timeout waiting for rate limit token: {api_name}")
+                        return False
+                    wait = min(wait, remaining)
 
-            # Wait before checking again
-            time.sleep(0.1)
+                # Releases the lock while waiting; release()/reset() wake us early
+                lock.wait(timeout=wait)
 
     def acquire(self, api_name: str, timeout: Optional[float] = 60) -> bool:
         """
@@ -104,7 +152,8 @@ class RateLimiter:
         """
         # Check database for recent usage (backup check)
         usage_count = db.get_api_usage_count(api_name, hours=1)
-        max_requests = MAX_REQUESTS_PER_HOUR.get(api_name, 100)
+        with self._get_lock(api_name):
+            max_requests = self._get_bucket(api_name)['max_tokens']
 
         if usage_count >= max_requests:
             logger.warning(
@@ -116,6 +165,87 @@ class RateLimiter:
         # Acquire token from bucket
         return self.wait_for_token(api_name, timeout)
 
+    def acquire_many(self, api_name: str, n: int, timeout: Optional[float] = 60) -> bool:
+        """
+        Atomically acquire several tokens in a single lock hold.
+
+        Useful when a caller knows it is about to make a burst of requests
+        (e.g. every item on a search results page) and wants to pay the
+        lock and database check once instead of per request.
+
+        Args:
+            api_name: Name of the API/service
+            n: Number of tokens to acquire
+            timeout: Maximum time to wait in seconds (None = wait forever)
+
+        Returns:
+            True if all tokens were acquired, False if timeout or limit exceeded
+        """
+        if n <= 0:
+            return True
+
+        usage_count = db.get_api_usage_count(api_name, hours=1)
+        with self._get_lock(api_name):
+            max_requests = self._get_bucket(api_name)['max_tokens']
+
+        if usage_count + n > max_requests or n > max_requests:
+            logger.warning(
+                f"Rate limit exceeded for {api_name}: "
+                f"{usage_count}+{n}/{max_requests} requests in last hour"
+            )
+            return False
+
+        return self._take_tokens(api_name, n, timeout)
+
+    def release(self, api_name: str, n: int = 1):
+        """
+        Return unused tokens to an API's bucket.
+
+        Args:
+            api_name: Name of the API/service
+            n: Number of tokens to give back
+        """
+        if n <= 0:
+            return
+
+        lock = self._get_lock(api_name)
+        with lock:
+            bucket = self._get_bucket(api_name)
+            self._refill_bucket(bucket)
+            bucket['tokens'] = min(bucket['max_tokens'], bucket['tokens'] + n)
+            self._stats_cache.pop(api_name, None)
+            lock.notify(n)
+
+    @contextmanager
+    def reserve(self, api_name: str, n: int = 1, timeout: Optional[float] = 60):
+        """
+        Reserve a burst of tokens for the duration of a block.
+
+        Tokens the caller did not mark as used are returned to the bucket on
+        exit. If the reservation could not be made, ``granted`` is 0.
+
+        Example:
+            with rate_limiter.reserve('bestbuy', 10) as reservation:
+                for url in urls:
+                    if not reservation.use():
+                        break
+                    fetch(url)
+
+        Args:
+            api_name: Name of the API/service
+            n: Number of tokens to reserve
+            timeout: Maximum time to wait in seconds
+
+        Yields:
+            TokenReservation tracking granted and used tokens
+        """
+        granted = n if self.acquire_many(api_name, n, timeout) else 0
+        reservation = TokenReservation(granted)
+        try:
+            yield reservation
+        finally:
+            self.release(api_name, reservation.granted - reservation.used)
+
     def get_remaining_requests(self, api_name: str) -> int:
         """Get the number of available requests."""
         lock = self._get_lock(api_name)
@@ -147,12 +277,24 @@ class RateLimiter:
                 bucket = self.buckets[api_name]
                 bucket['tokens'] = bucket['max_tokens']
                 bucket['last_refill'] = datetime.now()
+                self._stats_cache.pop(api_name, None)
+                lock.notify_all()
                 logger.info(f"Rate limiter reset for {api_name}")
 
     def get_statistics(self) -> Dict[str, Dict]:
-        """Get statistics for all rate limiters."""
+        """
+        Get statistics for all rate limiters.
+
+        Per-API entries are cached for STATS_CACHE_TTL seconds and dropped
+        as soon as a token is taken from or returned to that bucket.
+        """
         stats = {}
-        for api_name in self.buckets:
+        for api_name in list(self.buckets):
+            cached_at, cached = self._stats_cache.get(api_name, (0.0, None))
+            if cached is not None and time.monotonic() - cached_at < STATS_CACHE_TTL:
+                stats[api_name] = cached
+                continue
+
             lock = self._get_lock(api_name)
             with lock:
                 bucket = self._get_bucket(api_name)
@@ -161,17 +303,54 @@ class RateLimiter:
                 # Get database stats
                 usage_count = db.get_api_usage_count(api_name, hours=1)
 
-                stats[api_name] = {
+                if bucket['tokens'] >= 1:
+                    time_until_next = 0.0
+                else:
+                    time_until_next = (1 - bucket['tokens']) / bucket['refill_rate']
+
+                entry = {
                     'available_tokens': int(bucket['tokens']),
                     'max_tokens': bucket['max_tokens'],
                     'usage_last_hour': usage_count,
-                    'limit_per_hour': MAX_REQUESTS_PER_HOUR.get(api_name, 100),
-                    'time_until_next': self.get_time_until_available(api_name),
+                    'limit_per_hour': bucket['max_tokens'],
+                    'time_until_next': time_until_next,
                 }
 
+            self._stats_cache[api_name] = (time.monotonic(), entry)
+            stats[api_name] = entry
+
         return stats
 
 
+class ThrottleHandle:
+    """
+    Per-key throttle state handed out by RequestThrottler.handle.
+
+    Scrapers that always throttle the same retailer can keep a handle and
+    call ``handle.throttle()`` to skip the per-call key lookups.
+    """
+
+    __slots__ = ('key', 'last', 'lock', '_throttler')
+
+    def __init__(self, throttler: 'RequestThrottler', key: str):
+        self.key = key
+        self.last = 0.0
+        self.lock = Lock()
+        self._throttler = throttler
+
+    def throttle(self):
+        """Sleep until a random delay has passed since the last request."""
+        with self.lock:
+            target = self.last + self._throttler._next_delay()
+            now = time.monotonic()
+
+            if now < target:
+                logger.debug(f"Throttling {self.key}: sleeping for {target - now:.2f}s")
+                time.sleep(target - now)
+
+            self.last = max(target, time.monotonic())
+
+
 class RequestThrottler:
     """Simple delay-based throttler for scraping."""
 
@@ -185,14 +364,27 @@ class RequestThrottler:
         """
         self.min_delay = min_delay
         self.max_delay = max_delay
-        self.last_request_time: Dict[str, float] = {}
-        self.locks: Dict[str, Lock] = {}
-
-    def _get_lock(self, key: str) -> Lock:
-        """Get or create a lock for a key."""
-        if key not in self.locks:
-            self.locks[key] = Lock()
-        return self.locks[key]
+        self.handles: Dict[str, ThrottleHandle] = {}
+        self._delay_buf = np.empty(0)
+        self._delay_idx = 0
+        self._delay_lock = Lock()
+
+    def handle(self, key: str = 'default') -> ThrottleHandle:
+        """Get or create the throttle handle for a key."""
+        handle = self.handles.get(key)
+        if handle is None:
+            handle = self.handles.setdefault(key, ThrottleHandle(self, key))
+        return handle
+
+    def _next_delay(self) -> float:
+        """Pop the next random delay, refilling the batch when it runs out."""
+        with self._delay_lock:
+            if self._delay_idx >= len(self._delay_buf):
+                self._delay_buf = _rng.uniform(self.min_delay, self.max_delay, _DELAY_BATCH_SIZE)
+                self._delay_idx = 0
+            delay = self._delay_buf[self._delay_idx]
+            self._delay_idx += 1
+        return float(delay)
 
     def throttle(self, key: str = 'default'):
         """
@@ -201,22 +393,7 @@ class RequestThrottler:
         Args:
             key: Identifier for the throttle (e.g., 'amazon', 'bestbuy')
         """
-        import random
-
-        lock = self._get_lock(key)
-        with lock:
-            now = time.time()
-            last_time = self.last_request_time.get(key, 0)
-
-            elapsed = now - last_time
-            delay = random.uniform(self.min_delay, self.max_delay)
-
-            if elapsed < delay:
-                sleep_time = delay - elapsed
-                logger.debug(f"Throttling {key}: sleeping for {sleep_time:.2f}s")
-                time.sleep(sleep_time)
-
-            self.last_request_time[key] = time.time()
+        self.handle(key).throttle()
 
 
 # Singleton instances
@@ -3,7 +3,8 @@ Configuration management for Document Intelligence Platform.
 Loads and validates settings from environment variables.
 """
 
-from typing import List, Optional
+from functools import cached_property
+from typing import FrozenSet, List, Optional
 from pydantic import Field, validator
 from pydantic_settings import BaseSettings
 from pathlib import Path
@@ -26,6 +27,11 @@ class Settings(BaseSettings):
         default="gpt-3.5-turbo",
         env="OPENAI_CHEAP_MODEL"
     )
+    embedding_max_concurrency: int = Field(default=4, env="EMBEDDING_MAX_CONCURRENCY")
+    embedding_tokens_per_minute: int = Field(default=1_000_000, env="EMBEDDING_TOKENS_PER_MINUTE")
+    embedding_cache_enabled: bool = Field(default=True, env="EMBEDDING_CACHE_ENABLED")
+    embedding_cache_size: int = Field(default=10000, env="EMBEDDING_CACHE_SIZE")
+    embedding_cache_ttl: int = Field(default=30 * 24 * 3600, env="EMBEDDING_CACHE_TTL")
 
     # Pinecone Configuration
     pinecone_api_key: str = Field(..., env="PINECONE_API_KEY")
@@ -35,11 +41,19 @@ class Settings(BaseSettings):
         env="PINECONE_INDEX_NAME"
     )
     pinecone_dimension: int = Field(default=3072, env="PINECONE_DIMENSION")
+    pinecone_upsert_concurrency: int = Field(default=8, env="PINECONE_UPSERT_CONCURRENCY")
 
     # Database Configuration
     database_url: str = Field(..., env="DATABASE_URL")
     database_pool_size: int = Field(default=10, env="DATABASE_POOL_SIZE")
     database_max_overflow: int = Field(default=20, env="DATABASE_MAX_OVERFLOW")
+    database_pgbouncer: bool = Field(default=False, env="DATABASE_PGBOUNCER")
+    search_history_batch_size: int = Field(default=500, env="SEARCH_HISTORY_BATCH_SIZE")
+    search_history_flush_interval: float = Field(
+        default=2.0,
+        env="SEARCH_HISTORY_FLUSH_INTERVAL"
+    )
+    search_history_queue_size: int = Field(default=10_000, env="SEARCH_HISTORY_QUEUE_SIZE")
 
     # Redis Configuration
     redis_url: str = Field(
@@ -47,6 +61,7 @@ class Settings(BaseSettings):
         env="REDIS_URL"
     )
     redis_max_connections: int = Field(default=50, env="REDIS_MAX_CONNECTIONS")
+    analytics_cache_ttl: int = Field(default=60, env="ANALYTICS_CACHE_TTL")
 
     # Celery Configuration
     celery_broker_url: str = Field(
@@ -144,8 +159,9 @@ class Settings(BaseSettings):
     @validator("upload_dir", "processed_dir", pre=True)
     def create_directories(cls, v):
         """Ensure directories exist."""
-        path = Path(v) if isinstance(v, str) else v
-        path.mkdir(parents=True, exist_ok=True)
+        path = v if isinstance(v, Path) else Path(v)
+        if not path.is_dir():
+            path.mkdir(parents=True, exist_ok=True)
         return path
 
     @property
@@ -153,6 +169,13 @@ class Settings(BaseSettings):
         """Get allowed extensions as a list."""
         return [ext.strip() for ext in self.allowed_extensions.split(",")]
 
+    @cached_property
+    def allowed_extensions_set(self) -> FrozenSet[str]:
+        """Get allowed extensions as a frozenset, parsed once for O(1) lookups."""
+        return frozenset(
+            ext.strip().lower() for ext in self.allowed_extensions.split(",")
+        )
+
     @property
     def max_file_size_bytes(self) -> int:
         """Get max file size in bytes."""
@@ -3,13 +3,26 @@ Example script demonstrating API usage for Document Intelligence Platform.
 """
 
 import requests
-import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configuration
 API_BASE_URL = "http://localhost:8000/api"
 SAMPLE_DOCUMENT = "sample.pdf"  # Replace with your document
 
+# Shared session so every call reuses one keep-alive connection
+SESSION = requests.Session()
+SESSION.mount(
+    "http://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    )
+)
+
 
 def upload_document(file_path: str):
     """Upload a document to the platform."""
@@ -17,9 +30,9 @@ def upload_document(file_path: str):
 
     with open(file_path, 'rb') as f:
         files = {'file': (Path(file_path).name, f)}
-        response = requests.post(f"{API_BASE_URL}/documents/upload", files=files)
+        response = SESSION.post(f"{API_BASE_URL}/documents/upload", files=files)
 
-    if response.status_code == 200:
+    if response.status_code in (200, 202):
         data = response.json()
         print(f"✅ Upload successful! Document ID: {data['id']}")
         return data['id']
@@ -32,7 +45,7 @@ def check_document_status(doc_id: int):
     """Check document processing status."""
     print(f"\n🔍 Checking status of document {doc_id}")
 
-    response = requests.get(f"{API_BASE_URL}/documents/{doc_id}")
+    response = SESSION.get(f"{API_BASE_URL}/documents/{doc_id}")
 
     if response.status_code == 200:
         data = response.json()
@@ -46,18 +59,25 @@ def check_document_status(doc_id: int):
         return None
 
 
-def search_documents(query: str, strategy: str = "hybrid", top_k: int = 5):
-    """Search for documents."""
-    print(f"\n🔍 Searching for: '{query}'")
-    print(f"Strategy: {strategy}")
-
+def _post_search(query: str, strategy: str = "hybrid", top_k: int = 5) -> requests.Response:
+    """Send a search request without printing anything."""
     payload = {
         "query": query,
         "top_k": top_k,
         "strategy": strategy
     }
 
-    response = requests.post(f"{API_BASE_URL}/search/", json=payload)
+    return SESSION.post(f"{API_BASE_URL}/search/", json=payload)
+
+
+def search_documents(query: str, strategy: str = "hybrid", top_k: int = 5,
+                     response: requests.Response = None):
+    """Search for documents, optionally reporting an already-fetched response."""
+    print(f"\n🔍 Searching for: '{query}'")
+    print(f"Strategy: {strategy}")
+
+    if response is None:
+        response = _post_search(query, strategy, top_k)
 
     if response.status_code == 200:
         data = response.json()
@@ -75,18 +95,25 @@ def search_documents(query: str, strategy: str = "hybrid", top_k: int = 5):
         return None
 
 
-def ask_question(question: str, strategy: str = "hybrid", top_k: int = 3):
-    """Ask a question using RAG."""
-    print(f"\n💬 Asking: '{question}'")
-    print(f"Strategy: {strategy}")
-
+def _post_question(question: str, strategy: str = "hybrid", top_k: int = 3) -> requests.Response:
+    """Send a RAG query without printing anything."""
     payload = {
         "question": question,
         "top_k": top_k,
         "strategy": strategy
     }
 
-    response = requests.post(f"{API_BASE_URL}/search/query", json=payload)
+    return SESSION.post(f"{API_BASE_URL}/search/query", json=payload)
+
+
+def ask_question(question: str, strategy: str = "hybrid", top_k: int = 3,
+                 response: requests.Response = None):
+    """Ask a question using RAG, optionally reporting an already-fetched response."""
+    print(f"\n💬 Asking: '{question}'")
+    print(f"Strategy: {strategy}")
+
+    if response is None:
+        response = _post_question(question, strategy, top_k)
 
     if response.status_code == 200:
         data = response.json()
@@ -114,7 +141,7 @@ def get_analytics():
     print("\n📊 Fetching analytics...")
 
     # Document overview
-    response = requests.get(f"{API_BASE_URL}/analytics/overview")
+    response = SESSION.get(f"{API_BASE_URL}/analytics/overview")
     if response.status_code == 200:
         data = response.json()
         print("\n📄 Document Overview:")
@@ -128,7 +155,7 @@ def get_analytics():
                 print(f"    {doc_type}: {count}")
 
     # Search stats
-    response = requests.get(f"{API_BASE_URL}/analytics/search-stats?days=30")
+    response = SESSION.get(f"{API_BASE_URL}/analytics/search-stats?days=30")
     if response.status_code == 200:
         data = response.json()
         print("\n🔍 Search Statistics (Last 30 days):")
@@ -150,57 +177,37 @@ def main():
     # 1. Upload a document (commented out - provide your own file)
     # doc_id = upload_document("path/to/your/document.pdf")
     # if doc_id:
-    #     time.sleep(2)  # Wait for processing
-    #     check_document_status(doc_id)
-
-    # 2. Search examples
-    print("\n" + "=" * 60)
-    print("SEARCH EXAMPLES")
-    print("=" * 60)
-
-    # Hybrid search
-    search_documents(
-        query="machine learning algorithms",
-        strategy="hybrid",
-        top_k=5
-    )
-
-    time.sleep(1)
-
-    # Vector search
-    search_documents(
-        query="data analysis techniques",
-        strategy="vector",
-        top_k=5
-    )
-
-    time.sleep(1)
-
-    # Multi-query search
-    search_documents(
-        query="neural networks",
-        strategy="multi_query",
-        top_k=5
-    )
-
-    # 3. RAG Question Answering
-    print("\n" + "=" * 60)
-    print("RAG QUESTION ANSWERING")
-    print("=" * 60)
-
-    ask_question(
-        question="What are the main topics discussed in the documents?",
-        strategy="hybrid",
-        top_k=5
-    )
-
-    time.sleep(1)
-
-    ask_question(
-        question="Summarize the key findings from the research papers",
-        strategy="multi_query",
-        top_k=5
-    )
+    #     check_document_status(doc_id)  # Processing runs in the background
+
+    # 2 & 3. Searches and questions are independent, so send them all at
+    # once and print the results in order as they come back
+    searches = [
+        ("machine learning algorithms", "hybrid", 5),
+        ("data analysis techniques", "vector", 5),
+        ("neural networks", "multi_query", 5),
+    ]
+    questions = [
+        ("What are the main topics discussed in the documents?", "hybrid", 5),
+        ("Summarize the key findings from the research papers", "multi_query", 5),
+    ]
+
+    with ThreadPoolExecutor(max_workers=len(searches) + len(questions)) as executor:
+        search_futures = [executor.submit(_post_search, *args) for args in searches]
+        question_futures = [executor.submit(_post_question, *args) for args in questions]
+
+        print("\n" + "=" * 60)
+        print("SEARCH EXAMPLES")
+        print("=" * 60)
+
+        for args, future in zip(searches, search_futures):
+            search_documents(*args, response=future.result())
+
+        print("\n" + "=" * 60)
+        print("RAG QUESTION ANSWERING")
+        print("=" * 60)
+
+        for args, future in zip(questions, question_futures):
+            ask_question(*args, response=future.result())
 
     # 4. Get analytics
     print("\n" + "=" * 60)
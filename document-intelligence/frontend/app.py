@@ -11,17 +11,9 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import settings
+from frontend.pages import analytics, search, upload, viewer
 
-# Page configuration
-st.set_page_config(
-    page_title=settings.app_name,
-    page_icon="📚",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Custom CSS
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -35,6 +27,19 @@ st.markdown("""
         border-radius: 0.5rem;
         border-left: 4px solid #1E88E5;
     }
+    .quick-stats {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 1rem;
+    }
+    .metric-label {
+        font-size: 0.875rem;
+        color: #555555;
+    }
+    .metric-value {
+        font-size: 2rem;
+        font-weight: 600;
+    }
     .search-result {
         background-color: #ffffff;
         padding: 1rem;
@@ -43,19 +48,41 @@ st.markdown("""
         margin-bottom: 1rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Home page values are static placeholders, so the cards are plain HTML
+QUICK_STATS_HTML = """
+<div class="quick-stats">
+    <div class="metric-card"><div class="metric-label">Total Documents</div><div class="metric-value">0</div></div>
+    <div class="metric-card"><div class="metric-label">Total Searches</div><div class="metric-value">0</div></div>
+    <div class="metric-card"><div class="metric-label">Avg. Response Time</div><div class="metric-value">0ms</div></div>
+    <div class="metric-card"><div class="metric-label">Processing Queue</div><div class="metric-value">0</div></div>
+</div>
+"""
+
+PAGES = {
+    "📤 Upload Documents": upload.show,
+    "🔍 Search & Query": search.show,
+    "📊 Analytics Dashboard": analytics.show,
+    "📄 Document Viewer": viewer.show,
+}
+
+# Page configuration
+st.set_page_config(
+    page_title=settings.app_name,
+    page_icon="📚",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Sidebar navigation
 st.sidebar.title("📚 Navigation")
 page = st.sidebar.radio(
     "Go to",
-    [
-        "🏠 Home",
-        "📤 Upload Documents",
-        "🔍 Search & Query",
-        "📊 Analytics Dashboard",
-        "📄 Document Viewer"
-    ]
+    ["🏠 Home", *PAGES]
 )
 
 # Main content based on selected page
@@ -101,43 +128,10 @@ if page == "🏠 Home":
 
     # Quick stats
     st.markdown("### Quick Stats")
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-        st.metric("Total Documents", "0")
-        st.markdown('</div>', unsafe_allow_html=True)
-
-    with col2:
-        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-        st.metric("Total Searches", "0")
-        st.markdown('</div>', unsafe_allow_html=True)
-
-    with col3:
-        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-        st.metric("Avg. Response Time", "0ms")
-        st.markdown('</div>', unsafe_allow_html=True)
-
-    with col4:
-        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-        st.metric("Processing Queue", "0")
-        st.markdown('</div>', unsafe_allow_html=True)
-
-elif page == "📤 Upload Documents":
-    from frontend.pages import upload
-    upload.show()
-
-elif page == "🔍 Search & Query":
-    from frontend.pages import search
-    search.show()
-
-elif page == "📊 Analytics Dashboard":
-    from frontend.pages import analytics
-    analytics.show()
-
-elif page == "📄 Document Viewer":
-    from frontend.pages import viewer
-    viewer.show()
+    st.markdown(QUICK_STATS_HTML, unsafe_allow_html=True)
+
+else:
+    PAGES[page]()
 
 # Footer
 st.sidebar.markdown("---")
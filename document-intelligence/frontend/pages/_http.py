@@ -0,0 +1,48 @@
+"""
+Shared HTTP session and helpers for the Streamlit pages.
+"""
+
+import streamlit as st
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Get a process-wide requests session with a keep-alive connection pool."""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+    return session
+
+
+@st.cache_resource
+def _etag_store() -> dict:
+    """Process-wide map of (url, params) -> (etag, decoded body)."""
+    return {}
+
+
+def get_json_conditional(url: str, params: dict = None, timeout: float = 10):
+    """
+    GET a JSON resource, revalidating a previous copy with If-None-Match.
+
+    When the server answers 304 the stored body is returned without
+    transferring or decoding the payload again.
+    """
+    key = (url, tuple(sorted((params or {}).items())))
+    store = _etag_store()
+    cached = store.get(key)
+
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    response = get_session().get(url, params=params, headers=headers, timeout=timeout)
+
+    if response.status_code == 304 and cached:
+        return cached[1]
+
+    response.raise_for_status()
+    data = response.json()
+
+    etag = response.headers.get("ETag")
+    if etag:
+        store[key] = (etag, data)
+
+    return data
@@ -3,259 +3,309 @@ Analytics dashboard page for Streamlit.
 """
 
 import streamlit as st
-import requests
-import plotly.express as px
-import plotly.graph_objects as go
-from pathlib import Path
-import sys
-import pandas as pd
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import pyarrow as pa
 
 from config.settings import settings
+from frontend.pages._http import get_session
+
+API_URL = f"http://{settings.api_host}:{settings.api_port}/api/analytics"
+
+# Upper bound on points handed to Plotly for a single time series
+MAX_CHART_POINTS = 2000
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_overview():
+    """Fetch the document overview, cached across reruns."""
+    response = get_session().get(f"{API_URL}/overview", timeout=5)
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_search_stats(days: int):
+    """Fetch search statistics for the last `days` days, cached across reruns."""
+    response = get_session().get(f"{API_URL}/search-stats", params={"days": days}, timeout=5)
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_content_intel():
+    """Fetch content intelligence, cached across reruns."""
+    response = get_session().get(f"{API_URL}/content-intelligence", timeout=5)
+    response.raise_for_status()
+    return response.json()
 
 
 def show():
     """Display analytics dashboard."""
     st.title("📊 Analytics Dashboard")
 
+    if st.button("🔄 Refresh"):
+        _fetch_overview.clear()
+        _fetch_search_stats.clear()
+        _fetch_content_intel.clear()
+
     # Tabs for different analytics
     tab1, tab2, tab3 = st.tabs(["📄 Documents", "🔍 Search", "🧠 Content Intelligence"])
 
+    # The search tab's slider stores its value under this key, so it is
+    # known before the tab renders and all three requests can start now.
+    # The fragments below then read the warmed caches.
+    days = st.session_state.get("search_stats_days", 30)
+
+    # Workers run under this script's context so the cached fetchers can
+    # use it. A failed fetch isn't cached: the tab's _load retries it and
+    # reports the error there, so here it is only retrieved.
+    with ThreadPoolExecutor(
+        max_workers=3,
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx())
+    ) as executor:
+        futures = [
+            executor.submit(_fetch_overview),
+            executor.submit(_fetch_search_stats, days),
+            executor.submit(_fetch_content_intel),
+        ]
+        for future in futures:
+            future.exception()
+
     with tab1:
+        st.markdown("### Document Overview")
         show_document_analytics()
 
     with tab2:
+        st.markdown("### Search Statistics")
         show_search_analytics()
 
     with tab3:
+        st.markdown("### Content Intelligence")
         show_content_intelligence()
 
 
-def show_document_analytics():
-    """Display document analytics."""
-    st.markdown("### Document Overview")
-
+def _load(fetch, *args):
+    """Call a cached fetcher, reporting API errors in the current tab."""
     try:
-        response = requests.get(
-            f"http://{settings.api_host}:{settings.api_port}/api/analytics/overview"
-        )
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Metrics
-            col1, col2, col3, col4 = st.columns(4)
-
-            with col1:
-                st.metric("Total Documents", data.get("total_documents", 0))
-
-            with col2:
-                st.metric("Total Pages", data.get("total_pages", 0))
-
-            with col3:
-                st.metric("Total Words", f"{data.get('total_words', 0):,}")
-
-            with col4:
-                avg_time = data.get("avg_processing_time")
-                st.metric(
-                    "Avg. Processing Time",
-                    f"{avg_time:.2f}s" if avg_time else "N/A"
-                )
-
-            st.markdown("---")
-
-            # Charts
-            col1, col2 = st.columns(2)
-
-            with col1:
-                # Documents by type
-                type_data = data.get("documents_by_type", {})
-                if type_data:
-                    fig = px.pie(
-                        names=list(type_data.keys()),
-                        values=list(type_data.values()),
-                        title="Documents by Type"
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info("No data available")
-
-            with col2:
-                # Documents by status
-                status_data = data.get("documents_by_status", {})
-                if status_data:
-                    fig = px.bar(
-                        x=list(status_data.keys()),
-                        y=list(status_data.values()),
-                        title="Documents by Status",
-                        labels={"x": "Status", "y": "Count"}
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info("No data available")
-
-        else:
-            st.error("Failed to fetch document analytics")
-
+        return fetch(*args)
     except Exception as e:
         st.error(f"API error: {str(e)}")
         st.info("Make sure the backend API is running.")
+        return None
 
 
-def show_search_analytics():
-    """Display search analytics."""
-    st.markdown("### Search Statistics")
-
-    # Days selector
-    days = st.slider("Days to Analyze", 7, 90, 30)
+def _downsample_m4(x: list, y: list, target_points: int = MAX_CHART_POINTS):
+    """
+    Reduce a time series to roughly `target_points` points, M4-style.
 
-    try:
-        response = requests.get(
-            f"http://{settings.api_host}:{settings.api_port}/api/analytics/search-stats",
-            params={"days": days}
-        )
+    Points are grouped into consecutive buckets; each bucket keeps its first,
+    last, minimum and maximum points, which preserves the visual envelope of
+    a line chart. Short series are returned unchanged.
+    """
+    n = len(y)
+    if n <= target_points:
+        return x, y
 
-        if response.status_code == 200:
-            data = response.json()
-
-            # Metrics
-            col1, col2, col3 = st.columns(3)
-
-            with col1:
-                st.metric("Total Searches", data.get("total_searches", 0))
-
-            with col2:
-                avg_time = data.get("avg_execution_time", 0)
-                st.metric("Avg. Execution Time", f"{avg_time:.0f}ms")
-
-            with col3:
-                strategies = data.get("searches_by_strategy", {})
-                most_used = max(strategies.items(), key=lambda x: x[1])[0] if strategies else "N/A"
-                st.metric("Most Used Strategy", most_used)
-
-            st.markdown("---")
-
-            # Top queries
-            st.markdown("### 🔥 Top Queries")
-
-            top_queries = data.get("top_queries", [])
-            if top_queries:
-                df = pd.DataFrame(top_queries)
-                st.dataframe(
-                    df,
-                    column_config={
-                        "query": "Query",
-                        "count": "Count",
-                        "avg_score": st.column_config.NumberColumn(
-                            "Avg. Score",
-                            format="%.3f"
-                        )
-                    },
-                    hide_index=True,
-                    use_container_width=True
-                )
-            else:
-                st.info("No search data available")
-
-            st.markdown("---")
-
-            # Charts
-            col1, col2 = st.columns(2)
-
-            with col1:
-                # Searches by strategy
-                strategy_data = data.get("searches_by_strategy", {})
-                if strategy_data:
-                    fig = px.pie(
-                        names=list(strategy_data.keys()),
-                        values=list(strategy_data.values()),
-                        title="Searches by Strategy"
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-
-            with col2:
-                # Searches over time
-                time_data = data.get("searches_over_time", [])
-                if time_data:
-                    df = pd.DataFrame(time_data)
-                    fig = px.line(
-                        df,
-                        x="date",
-                        y="count",
-                        title="Search Volume Over Time",
-                        labels={"date": "Date", "count": "Number of Searches"}
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
+    bucket_size = -(-n * 4 // target_points)
+    keep = []
+    for start in range(0, n, bucket_size):
+        end = min(start + bucket_size, n)
+        bucket = range(start, end)
+        lo = min(bucket, key=y.__getitem__)
+        hi = max(bucket, key=y.__getitem__)
+        keep.extend(sorted({start, lo, hi, end - 1}))
 
-        else:
-            st.error("Failed to fetch search analytics")
+    return [x[i] for i in keep], [y[i] for i in keep]
 
-    except Exception as e:
-        st.error(f"API error: {str(e)}")
 
+@st.fragment
+def show_document_analytics():
+    """Display document analytics."""
+    # Deferred so the other pages never pay for importing plotly
+    import plotly.graph_objects as go
 
-def show_content_intelligence():
-    """Display content intelligence analytics."""
-    st.markdown("### Content Intelligence")
+    data = _load(_fetch_overview)
+    if data is None:
+        return
 
-    try:
-        response = requests.get(
-            f"http://{settings.api_host}:{settings.api_port}/api/analytics/content-intelligence"
-        )
+    # Metrics
+    col1, col2, col3, col4 = st.columns(4)
 
-        if response.status_code == 200:
-            data = response.json()
+    with col1:
+        st.metric("Total Documents", data.get("total_documents", 0))
 
-            # Metrics
-            col1, col2 = st.columns(2)
+    with col2:
+        st.metric("Total Pages", data.get("total_pages", 0))
 
-            with col1:
-                avg_length = data.get("avg_document_length", 0)
-                st.metric("Avg. Document Length", f"{avg_length:.0f} words")
+    with col3:
+        st.metric("Total Words", f"{data.get('total_words', 0):,}")
 
-            with col2:
-                lang_dist = data.get("language_distribution", {})
-                most_common_lang = max(lang_dist.items(), key=lambda x: x[1])[0] if lang_dist else "N/A"
-                st.metric("Most Common Language", most_common_lang.upper())
-
-            st.markdown("---")
+    with col4:
+        avg_time = data.get("avg_processing_time")
+        st.metric(
+            "Avg. Processing Time",
+            f"{avg_time:.2f}s" if avg_time else "N/A"
+        )
 
-            # Language distribution
-            st.markdown("### 🌍 Language Distribution")
+    st.markdown("---")
 
-            lang_data = data.get("language_distribution", {})
-            if lang_data:
-                fig = px.bar(
-                    x=list(lang_data.keys()),
-                    y=list(lang_data.values()),
-                    title="Documents by Language",
-                    labels={"x": "Language", "y": "Count"}
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No language data available")
-
-            # Top entities (placeholder)
-            st.markdown("### 🏷️ Top Entities")
-            entities = data.get("top_entities", [])
-            if entities:
-                df = pd.DataFrame(entities)
-                st.dataframe(df, use_container_width=True)
-            else:
-                st.info("Entity extraction not yet implemented")
-
-            # Top topics (placeholder)
-            st.markdown("### 📑 Top Topics")
-            topics = data.get("top_topics", [])
-            if topics:
-                df = pd.DataFrame(topics)
-                st.dataframe(df, use_container_width=True)
-            else:
-                st.info("Topic modeling not yet implemented")
+    # Charts
+    col1, col2 = st.columns(2)
 
+    with col1:
+        # Documents by type
+        type_data = data.get("documents_by_type", {})
+        if type_data:
+            fig = go.Figure(go.Pie(labels=list(type_data.keys()), values=list(type_data.values())))
+            fig.update_layout(title="Documents by Type")
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No data available")
+
+    with col2:
+        # Documents by status
+        status_data = data.get("documents_by_status", {})
+        if status_data:
+            fig = go.Figure(go.Bar(x=list(status_data.keys()), y=list(status_data.values())))
+            fig.update_layout(title="Documents by Status", xaxis_title="Status", yaxis_title="Count")
+            st.plotly_chart(fig, use_container_width=True)
         else:
-            st.error("Failed to fetch content intelligence")
+            st.info("No data available")
 
-    except Exception as e:
-        st.error(f"API error: {str(e)}")
+
+@st.fragment
+def show_search_analytics():
+    """Display search analytics."""
+    import plotly.graph_objects as go
+
+    # Submitting the form reruns only this fragment
+    with st.form("search_stats_form"):
+        st.slider("Days to Analyze", 7, 90, 30, key="search_stats_days")
+        st.form_submit_button("Update")
+
+    data = _load(_fetch_search_stats, st.session_state.search_stats_days)
+    if data is None:
+        return
+
+    # Metrics
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric("Total Searches", data.get("total_searches", 0))
+
+    with col2:
+        avg_time = data.get("avg_execution_time", 0)
+        st.metric("Avg. Execution Time", f"{avg_time:.0f}ms")
+
+    with col3:
+        st.metric("Most Used Strategy", data.get("most_used_strategy") or "N/A")
+
+    st.markdown("---")
+
+    # Top queries
+    st.markdown("### 🔥 Top Queries")
+
+    top_queries = data.get("top_queries", [])
+    if top_queries:
+        # Build the Arrow table Streamlit serializes anyway, skipping pandas
+        table = pa.table({
+            "query": [row["query"] for row in top_queries],
+            "count": [row["count"] for row in top_queries],
+            "avg_score": [row["avg_score"] for row in top_queries],
+        })
+        st.dataframe(
+            table,
+            column_config={
+                "query": "Query",
+                "count": "Count",
+                "avg_score": st.column_config.NumberColumn(
+                    "Avg. Score",
+                    format="%.3f"
+                )
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+    else:
+        st.info("No search data available")
+
+    st.markdown("---")
+
+    # Charts
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Searches by strategy
+        strategy_data = data.get("searches_by_strategy", {})
+        if strategy_data:
+            fig = go.Figure(go.Pie(labels=list(strategy_data.keys()), values=list(strategy_data.values())))
+            fig.update_layout(title="Searches by Strategy")
+            st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        # Searches over time
+        time_data = data.get("searches_over_time", [])
+        if time_data:
+            dates, counts = _downsample_m4(
+                [point["date"] for point in time_data],
+                [point["count"] for point in time_data]
+            )
+            # WebGL trace: drawn on a canvas instead of one SVG path per point
+            fig = go.Figure(go.Scattergl(x=dates, y=counts, mode="lines"))
+            fig.update_layout(
+                title="Search Volume Over Time",
+                xaxis_title="Date",
+                yaxis_title="Number of Searches"
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def show_content_intelligence():
+    """Display content intelligence analytics."""
+    import plotly.graph_objects as go
+
+    data = _load(_fetch_content_intel)
+    if data is None:
+        return
+
+    # Metrics
+    col1, col2 = st.columns(2)
+
+    with col1:
+        avg_length = data.get("avg_document_length", 0)
+        st.metric("Avg. Document Length", f"{avg_length:.0f} words")
+
+    with col2:
+        st.metric("Most Common Language", (data.get("most_common_language") or "N/A").upper())
+
+    st.markdown("---")
+
+    # Language distribution
+    st.markdown("### 🌍 Language Distribution")
+
+    lang_data = data.get("language_distribution", {})
+    if lang_data:
+        fig = go.Figure(go.Bar(x=list(lang_data.keys()), y=list(lang_data.values())))
+        fig.update_layout(title="Documents by Language", xaxis_title="Language", yaxis_title="Count")
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No language data available")
+
+    # Top entities (placeholder)
+    st.markdown("### 🏷️ Top Entities")
+    entities = data.get("top_entities", [])
+    if entities:
+        st.dataframe(pa.Table.from_pylist(entities), use_container_width=True)
+    else:
+        st.info("Entity extraction not yet implemented")
+
+    # Top topics (placeholder)
+    st.markdown("### 📑 Top Topics")
+    topics = data.get("top_topics", [])
+    if topics:
+        st.dataframe(pa.Table.from_pylist(topics), use_container_width=True)
+    else:
+        st.info("Topic modeling not yet implemented")
@@ -3,13 +3,12 @@ Search and query page for Streamlit dashboard.
 """
 
 import streamlit as st
-import requests
-from pathlib import Path
-import sys
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from config.settings import settings
+from frontend.pages._http import get_session
+
+SEARCH_SNIPPET_LENGTH = 500
+SOURCE_SNIPPET_LENGTH = 1000
 
 
 def show():
@@ -60,8 +59,17 @@ def show_search_tab():
 
         date_range = st.date_input("Date Range", [])
 
+    col1, col2 = st.columns([1, 5])
+    with col1:
+        search_clicked = st.button("Search", type="primary")
+    with col2:
+        # Repeated queries are served from cache; this forces a fresh call
+        if st.button("Force refresh", key="refresh_search"):
+            _post_search.clear()
+            search_clicked = True
+
     # Search button
-    if st.button("Search", type="primary") and query:
+    if search_clicked and query:
         with st.spinner("Searching..."):
             results = perform_search(
                 query=query,
@@ -100,8 +108,16 @@ def show_query_tab():
 
         num_sources = st.slider("Number of Sources", 1, 10, 5)
 
+    col1, col2 = st.columns([1, 5])
+    with col1:
+        ask_clicked = st.button("Ask", type="primary")
+    with col2:
+        if st.button("Force refresh", key="refresh_query"):
+            _post_rag_query.clear()
+            ask_clicked = True
+
     # Ask button
-    if st.button("Ask", type="primary") and question:
+    if ask_clicked and question:
         with st.spinner("Generating answer..."):
             result = perform_rag_query(
                 question=question,
@@ -113,28 +129,65 @@ def show_query_tab():
                 display_rag_result(result, question)
 
 
+class _APIError(Exception):
+    """Non-200 API response; carries the server's error detail."""
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _post_search(query: str, strategy: str, top_k: int, doc_type: str = None):
+    """POST a search request. Successful responses are cached by their arguments."""
+    payload = {
+        "query": query,
+        "top_k": top_k,
+        "strategy": strategy,
+        "snippet_length": SEARCH_SNIPPET_LENGTH
+    }
+
+    if doc_type:
+        payload["document_type"] = doc_type
+
+    response = get_session().post(
+        f"http://{settings.api_host}:{settings.api_port}/api/search/",
+        json=payload,
+        timeout=30
+    )
+
+    if response.status_code != 200:
+        raise _APIError(response.json().get('detail', 'Unknown error'))
+
+    return response.json()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _post_rag_query(question: str, strategy: str, top_k: int):
+    """POST a RAG query. Successful responses are cached by their arguments."""
+    payload = {
+        "question": question,
+        "top_k": top_k,
+        "strategy": strategy,
+        "snippet_length": SOURCE_SNIPPET_LENGTH
+    }
+
+    response = get_session().post(
+        f"http://{settings.api_host}:{settings.api_port}/api/search/query",
+        json=payload,
+        timeout=120
+    )
+
+    if response.status_code != 200:
+        raise _APIError(response.json().get('detail', 'Unknown error'))
+
+    return response.json()
+
+
 def perform_search(query: str, strategy: str, top_k: int, doc_type: str = None):
     """Perform search via API."""
     try:
-        payload = {
-            "query": query,
-            "top_k": top_k,
-            "strategy": strategy
-        }
-
-        if doc_type:
-            payload["document_type"] = doc_type
-
-        response = requests.post(
-            f"http://{settings.api_host}:{settings.api_port}/api/search/",
-            json=payload
-        )
+        return _post_search(query, strategy, top_k, doc_type)
 
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.error(f"Search failed: {response.json().get('detail', 'Unknown error')}")
-            return None
+    except _APIError as e:
+        st.error(f"Search failed: {str(e)}")
+        return None
 
     except Exception as e:
         st.error(f"API error: {str(e)}")
@@ -145,22 +198,11 @@ def perform_search(query: str, strategy: str, top_k: int, doc_type: str = None):
 def perform_rag_query(question: str, strategy: str, top_k: int):
     """Perform RAG query via API."""
     try:
-        payload = {
-            "question": question,
-            "top_k": top_k,
-            "strategy": strategy
-        }
-
-        response = requests.post(
-            f"http://{settings.api_host}:{settings.api_port}/api/search/query",
-            json=payload
-        )
+        return _post_rag_query(question, strategy, top_k)
 
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.error(f"Query failed: {response.json().get('detail', 'Unknown error')}")
-            return None
+    except _APIError as e:
+        st.error(f"Query failed: {str(e)}")
+        return None
 
     except Exception as e:
         st.error(f"API error: {str(e)}")
@@ -188,7 +230,7 @@ def display_search_results(results, query):
     for i, result in enumerate(results.get("results", []), 1):
         with st.expander(f"Result {i} - Score: {result['score']:.4f}"):
             st.markdown(f"**Content:**")
-            st.text(result['content'][:500] + ("..." if len(result['content']) > 500 else ""))
+            st.text(result['content'] + ("..." if result.get('content_truncated') else ""))
 
             if result.get('metadata'):
                 st.markdown("**Metadata:**")
@@ -226,7 +268,7 @@ def display_rag_result(result, question):
 
     for source in result.get("sources", []):
         with st.expander(f"Source {source['number']} - Score: {source['score']:.4f}"):
-            st.text(source['content'])
+            st.text(source['content'] + ("..." if source.get('content_truncated') else ""))
 
             if source.get('metadata'):
                 st.markdown("**Metadata:**")
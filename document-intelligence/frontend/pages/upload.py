@@ -3,13 +3,16 @@ Document upload page for Streamlit dashboard.
 """
 
 import streamlit as st
-import requests
 from pathlib import Path
-import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from requests_toolbelt import MultipartEncoder
 
 from config.settings import settings
+from frontend.pages import viewer
+from frontend.pages._http import get_json_conditional, get_session
+
+UPLOAD_WORKERS = 4
 
 
 def show():
@@ -34,19 +37,16 @@ def show():
     if uploaded_files:
         st.write(f"Selected {len(uploaded_files)} file(s)")
 
-        # Display files
-        for file in uploaded_files:
-            col1, col2, col3 = st.columns([3, 1, 1])
-
-            with col1:
-                st.text(file.name)
-
-            with col2:
-                size_mb = file.size / (1024 * 1024) if file.size else 0
-                st.text(f"{size_mb:.2f} MB")
-
-            with col3:
-                st.text(Path(file.name).suffix.upper())
+        # Display files as one table rather than three widgets per file
+        rows = [
+            {
+                "Name": file.name,
+                "Size (MB)": round((file.size or 0) / (1024 * 1024), 2),
+                "Type": Path(file.name).suffix.upper(),
+            }
+            for file in uploaded_files
+        ]
+        st.dataframe(rows, hide_index=True, use_container_width=True)
 
         # Upload button
         if st.button("Upload All", type="primary"):
@@ -57,42 +57,74 @@ def show():
     # Uploaded documents list
     st.subheader("Recent Uploads")
 
-    try:
-        response = requests.get(
-            f"http://{settings.api_host}:{settings.api_port}/api/documents/",
-            params={"limit": 10}
-        )
-
-        if response.status_code == 200:
-            data = response.json()
-            documents = data.get("documents", [])
-
-            if documents:
-                for doc in documents:
-                    with st.expander(f"📄 {doc['filename']}"):
-                        col1, col2 = st.columns(2)
-
-                        with col1:
-                            st.write(f"**Type:** {doc['document_type']}")
-                            st.write(f"**Status:** {doc['status']}")
-                            st.write(f"**Size:** {doc['file_size'] / 1024:.2f} KB")
+    if st.session_state.pop("last_delete", None) is not None:
+        st.success("Document deleted successfully!")
 
-                        with col2:
-                            st.write(f"**Pages:** {doc.get('page_count', 'N/A')}")
-                            st.write(f"**Words:** {doc.get('word_count', 'N/A')}")
-                            st.write(f"**Uploaded:** {doc['uploaded_at'][:10]}")
-
-                        if st.button(f"Delete", key=f"delete_{doc['id']}"):
-                            delete_document(doc['id'])
-            else:
-                st.info("No documents uploaded yet.")
-
-        else:
-            st.error("Failed to fetch documents from API.")
+    try:
+        documents = _fetch_documents(limit=10)
 
     except Exception as e:
         st.warning(f"API connection error: {str(e)}")
         st.info("Make sure the backend API is running.")
+        return
+
+    if documents:
+        rows = [
+            {
+                "Filename": doc['filename'],
+                "Type": doc['document_type'],
+                "Status": doc['status'],
+                "Size (KB)": round(doc['file_size'] / 1024, 2),
+                "Pages": doc.get('page_count'),
+                "Words": doc.get('word_count'),
+                "Uploaded": doc['uploaded_at'][:10],
+            }
+            for doc in documents
+        ]
+
+        event = st.dataframe(
+            rows,
+            hide_index=True,
+            use_container_width=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key="recent_uploads"
+        )
+
+        # Only the selected document gets a detail block and delete button
+        selected = event.selection.rows
+        if selected:
+            doc = documents[selected[0]]
+            with st.expander(f"📄 {doc['filename']}", expanded=True):
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.write(f"**Type:** {doc['document_type']}")
+                    st.write(f"**Status:** {doc['status']}")
+                    st.write(f"**Size:** {doc['file_size'] / 1024:.2f} KB")
+
+                with col2:
+                    st.write(f"**Pages:** {doc.get('page_count', 'N/A')}")
+                    st.write(f"**Words:** {doc.get('word_count', 'N/A')}")
+                    st.write(f"**Uploaded:** {doc['uploaded_at'][:10]}")
+
+                if st.button(f"Delete", key=f"delete_{doc['id']}"):
+                    delete_document(doc['id'])
+        else:
+            st.caption("Select a row to see details or delete it.")
+    else:
+        st.info("No documents uploaded yet.")
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_documents(limit: int):
+    """Fetch the most recent documents, cached across reruns."""
+    data = get_json_conditional(
+        f"http://{settings.api_host}:{settings.api_port}/api/documents/",
+        params={"limit": limit},
+        timeout=10
+    )
+    return data.get("documents", [])
 
 
 def upload_files(files):
@@ -101,58 +133,91 @@ def upload_files(files):
     status_text = st.empty()
 
     total_files = len(files)
-    successful = 0
-    failed = 0
+    session = get_session()
+    results = []
 
-    for i, file in enumerate(files):
-        status_text.text(f"Uploading {file.name}...")
+    status_text.text(f"Uploading {total_files} file(s)...")
 
-        try:
-            # Prepare file for upload
-            files_data = {"file": (file.name, file.getvalue(), file.type)}
+    # Uploads are independent and IO-bound; workers never touch Streamlit
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        futures = [executor.submit(_upload_one, session, file) for file in files]
 
-            # Upload to API
-            response = requests.post(
-                f"http://{settings.api_host}:{settings.api_port}/api/documents/upload",
-                files=files_data
-            )
+        for i, future in enumerate(as_completed(futures)):
+            results.append(future.result())
+            progress_bar.progress((i + 1) / total_files)
 
-            if response.status_code == 200:
-                successful += 1
-                st.success(f"✅ {file.name} uploaded successfully")
-            else:
-                failed += 1
-                error_detail = response.json().get("detail", "Unknown error")
-                st.error(f"❌ {file.name} failed: {error_detail}")
-
-        except Exception as e:
-            failed += 1
-            st.error(f"❌ {file.name} failed: {str(e)}")
+    status_text.text("Upload complete!")
 
-        # Update progress
-        progress_bar.progress((i + 1) / total_files)
+    successful = sum(1 for _, ok, _ in results if ok)
+    failed = total_files - successful
 
-    status_text.text("Upload complete!")
+    status_state = "error" if failed else "complete"
+    with st.status(f"Uploaded {successful} of {total_files} file(s)", state=status_state):
+        for filename, ok, detail in results:
+            if ok:
+                st.success(f"✅ {filename} uploaded successfully")
+            else:
+                st.error(f"❌ {filename} failed: {detail}")
 
     # Summary
     st.success(f"Upload Summary: {successful} successful, {failed} failed")
 
     if successful > 0:
+        _fetch_documents.clear()
+        viewer._fetch_document_index.clear()
         st.balloons()
 
 
+def _upload_one(session, file):
+    """
+    Upload a single file.
+
+    Runs on a worker thread, so it only returns a result tuple and never
+    calls Streamlit.
+
+    Returns:
+        Tuple of (filename, ok, detail)
+    """
+    try:
+        # Stream the multipart body from the upload buffer in chunks
+        file.seek(0)
+        encoder = MultipartEncoder(fields={"file": (file.name, file, file.type)})
+
+        # Upload to API
+        response = session.post(
+            f"http://{settings.api_host}:{settings.api_port}/api/documents/upload",
+            data=encoder,
+            headers={"Content-Type": encoder.content_type},
+            timeout=120
+        )
+
+        if response.status_code in (200, 202):
+            return file.name, True, None
+
+        return file.name, False, response.json().get("detail", "Unknown error")
+
+    except Exception as e:
+        return file.name, False, str(e)
+
+
 def delete_document(doc_id: int):
     """Delete a document."""
     try:
-        response = requests.delete(
-            f"http://{settings.api_host}:{settings.api_port}/api/documents/{doc_id}"
+        response = get_session().delete(
+            f"http://{settings.api_host}:{settings.api_port}/api/documents/{doc_id}",
+            timeout=10
         )
 
-        if response.status_code == 200:
-            st.success("Document deleted successfully!")
-            st.experimental_rerun()
-        else:
+        if response.status_code != 200:
             st.error("Failed to delete document")
+            return
 
     except Exception as e:
         st.error(f"Error deleting document: {str(e)}")
+        return
+
+    # Drop cached listings so the rerun re-queries them
+    _fetch_documents.clear()
+    viewer._fetch_document_index.clear()
+    st.session_state["last_delete"] = doc_id
+    st.rerun()
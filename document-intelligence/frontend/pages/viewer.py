@@ -3,13 +3,9 @@ Document viewer page for Streamlit dashboard.
 """
 
 import streamlit as st
-import requests
-from pathlib import Path
-import sys
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from config.settings import settings
+from frontend.pages._http import get_json_conditional, get_session
 
 
 def show():
@@ -23,47 +19,59 @@ def show():
 
     # Fetch documents
     try:
-        response = requests.get(
-            f"http://{settings.api_host}:{settings.api_port}/api/documents/",
-            params={"limit": 100}
-        )
+        documents = _fetch_document_index()
+    except Exception as e:
+        st.error(f"API error: {str(e)}")
+        st.info("Make sure the backend API is running.")
+        return
 
-        if response.status_code == 200:
-            data = response.json()
-            documents = data.get("documents", [])
+    if not documents:
+        st.info("No documents available. Please upload documents first.")
+        return
 
-            if not documents:
-                st.info("No documents available. Please upload documents first.")
-                return
+    # Narrow the options in Python so long corpora stay responsive
+    name_filter = st.text_input("Filter documents", placeholder="Type part of a filename...")
+    doc_ids = list(documents)
+    if name_filter:
+        needle = name_filter.lower()
+        doc_ids = [doc_id for doc_id in doc_ids if needle in documents[doc_id][0].lower()]
 
-            # Document selector
-            doc_options = {
-                f"{doc['filename']} ({doc['document_type']})": doc['id']
-                for doc in documents
-            }
+    if not doc_ids:
+        st.info("No documents match the filter.")
+        return
 
-            selected_doc_name = st.selectbox(
-                "Select Document",
-                options=list(doc_options.keys())
-            )
+    # Options are plain ids; labels come from the cached index
+    doc_id = st.selectbox(
+        "Select Document",
+        options=doc_ids,
+        format_func=lambda doc_id: f"{documents[doc_id][0]} ({documents[doc_id][1]})"
+    )
 
-            if selected_doc_name:
-                doc_id = doc_options[selected_doc_name]
-                display_document(doc_id)
+    if doc_id is not None:
+        display_document(doc_id)
 
-        else:
-            st.error("Failed to fetch documents from API")
 
-    except Exception as e:
-        st.error(f"API error: {str(e)}")
-        st.info("Make sure the backend API is running.")
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_document_index():
+    """Fetch a lightweight id -> (filename, document_type) index of documents."""
+    data = get_json_conditional(
+        f"http://{settings.api_host}:{settings.api_port}/api/documents/",
+        params={"limit": 100},
+        timeout=10
+    )
+
+    return {
+        doc['id']: (doc['filename'], doc['document_type'])
+        for doc in data.get("documents", [])
+    }
 
 
 def display_document(doc_id: int):
     """Display document details."""
     try:
-        response = requests.get(
-            f"http://{settings.api_host}:{settings.api_port}/api/documents/{doc_id}"
+        response = get_session().get(
+            f"http://{settings.api_host}:{settings.api_port}/api/documents/{doc_id}",
+            timeout=10
         )
 
         if response.status_code == 200:
@@ -113,7 +121,7 @@ def display_document(doc_id: int):
                             if answer.get("sources"):
                                 with st.expander("View Sources"):
                                     for source in answer["sources"]:
-                                        st.text(source["content"][:300] + "...")
+                                        st.text(source["content"] + ("..." if source.get("content_truncated") else ""))
 
         else:
             st.error(f"Failed to fetch document: {response.status_code}")
@@ -128,12 +136,14 @@ def query_document(question: str, doc_id: int):
         payload = {
             "question": question,
             "top_k": 3,
-            "strategy": "hybrid"
+            "strategy": "hybrid",
+            "snippet_length": 300
         }
 
-        response = requests.post(
+        response = get_session().post(
             f"http://{settings.api_host}:{settings.api_port}/api/search/query",
-            json=payload
+            json=payload,
+            timeout=120
         )
 
         if response.status_code == 200:
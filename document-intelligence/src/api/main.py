@@ -3,12 +3,15 @@ FastAPI main application.
 Entry point for the Document Intelligence Platform API.
 """
 
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from config.settings import settings
 from src.utils.logger import app_logger as logger
-from src.core.database import init_db
+from src.core.cache import response_cache
+from src.core.database import async_engine, init_db
+from src.core.search_history import search_history_writer
 
 # Import routers
 from src.api.routes import documents, search, analytics, auth
@@ -20,7 +23,8 @@ app = FastAPI(
     description="Enterprise Document Intelligence Platform with Hybrid Search and Advanced RAG",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -45,6 +49,14 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
 
+    # Connect response cache
+    try:
+        await response_cache.connect()
+    except Exception as e:
+        logger.error(f"Failed to connect response cache: {str(e)}")
+
+    search_history_writer.start()
+
     logger.info("Application startup complete")
 
 
@@ -53,6 +65,10 @@ async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Application shutting down")
 
+    await search_history_writer.stop()
+    await response_cache.close()
+    await async_engine.dispose()
+
 
 @app.get("/")
 async def root():
@@ -81,16 +97,31 @@ app.include_router(search.router, prefix="/api/search", tags=["Search"])
 app.include_router(analytics.router, prefix="/api/analytics", tags=["Analytics"])
 
 
+# Body for unhandled errors outside debug mode, encoded once
+_INTERNAL_ERROR_BODY = orjson.dumps({
+    "detail": "Internal server error",
+    "message": "An error occurred"
+})
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Handle all uncaught exceptions."""
-    logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    if not settings.debug:
+        logger.error(f"Unhandled exception: {type(exc).__name__}: {str(exc)}")
+        return Response(
+            status_code=500,
+            content=_INTERNAL_ERROR_BODY,
+            media_type="application/json"
+        )
+
+    logger.opt(exception=exc).error(f"Unhandled exception: {str(exc)}")
+    return ORJSONResponse(
         status_code=500,
         content={
             "detail": "Internal server error",
-            "message": str(exc) if settings.debug else "An error occurred"
+            "message": str(exc)
         }
     )
 
@@ -104,5 +135,7 @@ if __name__ == "__main__":
         port=settings.api_port,
         workers=settings.api_workers,
         reload=settings.debug,
-        log_level=settings.log_level.lower()
+        log_level=settings.log_level.lower(),
+        loop="uvloop",
+        http="httptools"
     )
@@ -4,13 +4,23 @@ Provides insights into documents, searches, and content.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import JSON, bindparam, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from typing import Optional
 from datetime import datetime, timedelta
-
+from functools import lru_cache
+import time
+
+from config.settings import settings
+from src.core.cache import (
+    CONTENT_INTELLIGENCE_CACHE_KEY,
+    OVERVIEW_CACHE_KEY,
+    SEARCH_STATS_CACHE_KEY,
+    response_cache
+)
 from src.core.database import get_db
-from src.core.models import Document, SearchHistory, DocumentType, ProcessingStatus
+from src.core.models import Document, SearchHistory
 from src.api.schemas import (
     DocumentOverviewResponse,
     SearchStatsResponse,
@@ -21,9 +31,115 @@ from src.utils.logger import app_logger as logger
 router = APIRouter()
 
 
+def _grouped_counts(column, *conditions):
+    """Subquery of (key, n) counts of rows grouped by `column`."""
+    return select(
+        column.label('key'),
+        func.count().label('n')
+    ).where(*conditions).group_by(column).subquery()
+
+
+def _json_rows(subquery, *order_by):
+    """
+    Scalar subquery folding every row of `subquery` into one JSON array.
+
+    Each row becomes a JSON array of its columns, in `order_by` order, so
+    several grouped result sets can ride along in a single SELECT.
+    """
+    return select(
+        func.json_agg(
+            aggregate_order_by(func.json_build_array(*subquery.c), *order_by),
+            type_=JSON
+        )
+    ).scalar_subquery()
+
+
+@lru_cache(maxsize=64)
+def _window_start(days: int, minute: int) -> datetime:
+    """
+    Start of a `days`-long analytics window, truncated to the minute.
+
+    `minute` is only the cache key: every request in the same minute gets
+    the same threshold, and with it the same cached search stats.
+    """
+    return datetime.utcnow().replace(second=0, microsecond=0) - timedelta(days=days)
+
+
+# Statements are built once at import; only the bound parameters change
+# per request, so SQLAlchemy's compiled cache and asyncpg's per-connection
+# prepared statements both hit on every call.
+
+_type_counts = _grouped_counts(Document.document_type)
+_status_counts = _grouped_counts(Document.status)
+
+# Every aggregate in one round-trip; grouped breakdowns come back as
+# ordered [key, count] pairs
+_OVERVIEW_QUERY = select(
+    func.count(Document.id),
+    func.sum(Document.page_count),
+    func.sum(Document.word_count),
+    # NULL for documents missing either timestamp; avg skips them
+    func.avg(
+        func.extract(
+            'epoch',
+            Document.processing_completed_at - Document.processing_started_at
+        )
+    ),
+    _json_rows(_type_counts, _type_counts.c.n.desc()),
+    _json_rows(_status_counts, _status_counts.c.n.desc()),
+)
+
+_recent_searches = SearchHistory.created_at >= bindparam('threshold')
+
+_top_query_counts = select(
+    SearchHistory.query,
+    func.count(SearchHistory.id).label('n'),
+    func.avg(SearchHistory.top_result_score).label('avg_score')
+).where(
+    _recent_searches
+).group_by(
+    SearchHistory.query
+).order_by(
+    func.count(SearchHistory.id).desc()
+).limit(10).subquery()
+
+_strategy_counts = _grouped_counts(SearchHistory.query_type, _recent_searches)
+
+_day = func.date(SearchHistory.created_at)
+_daily_counts = select(
+    _day.label('day'),
+    func.count(SearchHistory.id).label('n')
+).where(
+    _recent_searches
+).group_by(_day).subquery()
+
+# Totals plus every breakdown in one round-trip
+_SEARCH_STATS_QUERY = select(
+    func.count(SearchHistory.id),
+    func.avg(SearchHistory.execution_time_ms),
+    _json_rows(_top_query_counts, _top_query_counts.c.n.desc()),
+    _json_rows(_strategy_counts, _strategy_counts.c.n.desc()),
+    _json_rows(_daily_counts, _daily_counts.c.day),
+).where(_recent_searches)
+
+# Per-language document counts and word totals in a single pass over
+# idx_doc_language_words; the NULL-language group still contributes to the
+# overall average length
+_CONTENT_INTELLIGENCE_QUERY = select(
+    Document.language,
+    func.count(),
+    func.sum(Document.word_count),
+    func.count(Document.word_count),
+).group_by(
+    Document.language
+).order_by(
+    func.count().desc()
+)
+
+
 @router.get("/overview", response_model=DocumentOverviewResponse)
 async def get_document_overview(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get document overview analytics.
@@ -36,60 +152,39 @@ async def get_document_overview(
     """
     logger.info("Getting document overview analytics")
 
-    try:
-        # Total documents
-        total_documents = db.query(Document).count()
-
-        # Documents by type
-        type_counts = db.query(
-            Document.document_type,
-            func.count(Document.id)
-        ).group_by(Document.document_type).all()
-
-        documents_by_type = {
-            doc_type.value: count
-            for doc_type, count in type_counts
-        }
-
-        # Documents by status
-        status_counts = db.query(
-            Document.status,
-            func.count(Document.id)
-        ).group_by(Document.status).all()
-
-        documents_by_status = {
-            status.value: count
-            for status, count in status_counts
-        }
+    cached = await response_cache.get(OVERVIEW_CACHE_KEY)
+    if cached is not None:
+        return cached
 
-        # Total pages and words
-        total_pages = db.query(func.sum(Document.page_count)).scalar() or 0
-        total_words = db.query(func.sum(Document.word_count)).scalar() or 0
-
-        # Average processing time
-        avg_time_result = db.query(
-            func.avg(
-                func.extract(
-                    'epoch',
-                    Document.processing_completed_at - Document.processing_started_at
-                )
-            )
-        ).filter(
-            Document.processing_completed_at.isnot(None),
-            Document.processing_started_at.isnot(None)
-        ).scalar()
+    try:
+        (
+            total_documents,
+            total_pages,
+            total_words,
+            avg_time_result,
+            type_pairs,
+            status_pairs,
+        ) = (await db.execute(_OVERVIEW_QUERY)).one()
+
+        # Enum columns store their values, which is what the API reports
+        documents_by_type = dict(type_pairs or [])
+        documents_by_status = dict(status_pairs or [])
 
         avg_processing_time = float(avg_time_result) if avg_time_result else None
 
-        return DocumentOverviewResponse(
+        overview = DocumentOverviewResponse(
             total_documents=total_documents,
             documents_by_type=documents_by_type,
             documents_by_status=documents_by_status,
-            total_pages=int(total_pages),
-            total_words=int(total_words),
+            total_pages=int(total_pages or 0),
+            total_words=int(total_words or 0),
             avg_processing_time=avg_processing_time
         )
 
+        await response_cache.set(OVERVIEW_CACHE_KEY, overview.model_dump(), settings.analytics_cache_ttl)
+
+        return overview
+
     except Exception as e:
         logger.error(f"Failed to get document overview: {str(e)}")
         raise HTTPException(
@@ -101,7 +196,7 @@ async def get_document_overview(
 @router.get("/search-stats", response_model=SearchStatsResponse)
 async def get_search_stats(
     days: int = 30,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get search analytics.
@@ -115,34 +210,23 @@ async def get_search_stats(
     """
     logger.info(f"Getting search statistics for last {days} days")
 
+    minute = int(time.time() // 60)
+    cache_key = SEARCH_STATS_CACHE_KEY.format(days=days, minute=minute)
+
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        # Date threshold
-        date_threshold = datetime.utcnow() - timedelta(days=days)
-
-        # Total searches
-        total_searches = db.query(SearchHistory).filter(
-            SearchHistory.created_at >= date_threshold
-        ).count()
-
-        # Average execution time
-        avg_time = db.query(
-            func.avg(SearchHistory.execution_time_ms)
-        ).filter(
-            SearchHistory.created_at >= date_threshold
-        ).scalar() or 0.0
-
-        # Top queries
-        top_queries_result = db.query(
-            SearchHistory.query,
-            func.count(SearchHistory.id).label('count'),
-            func.avg(SearchHistory.top_result_score).label('avg_score')
-        ).filter(
-            SearchHistory.created_at >= date_threshold
-        ).group_by(
-            SearchHistory.query
-        ).order_by(
-            func.count(SearchHistory.id).desc()
-        ).limit(10).all()
+        date_threshold = _window_start(days, minute)
+
+        (
+            total_searches,
+            avg_time,
+            top_query_rows,
+            strategy_pairs,
+            daily_pairs,
+        ) = (await db.execute(_SEARCH_STATS_QUERY, {"threshold": date_threshold})).one()
 
         top_queries = [
             {
@@ -150,52 +234,38 @@ async def get_search_stats(
                 "count": count,
                 "avg_score": float(avg_score) if avg_score else 0.0
             }
-            for query, count, avg_score in top_queries_result
+            for query, count, avg_score in top_query_rows or []
         ]
 
-        # Searches by strategy
-        strategy_counts = db.query(
-            SearchHistory.query_type,
-            func.count(SearchHistory.id)
-        ).filter(
-            SearchHistory.created_at >= date_threshold
-        ).group_by(
-            SearchHistory.query_type
-        ).all()
-
+        # Most used first
         searches_by_strategy = {
             query_type: count
-            for query_type, count in strategy_counts
+            for query_type, count in strategy_pairs or []
         }
-
-        # Searches over time (daily)
-        searches_over_time_result = db.query(
-            func.date(SearchHistory.created_at).label('date'),
-            func.count(SearchHistory.id).label('count')
-        ).filter(
-            SearchHistory.created_at >= date_threshold
-        ).group_by(
-            func.date(SearchHistory.created_at)
-        ).order_by(
-            func.date(SearchHistory.created_at)
-        ).all()
+        most_used_strategy = next(iter(searches_by_strategy), None)
 
         searches_over_time = [
             {
-                "date": str(date),
+                "date": date,
                 "count": count
             }
-            for date, count in searches_over_time_result
+            for date, count in daily_pairs or []
         ]
 
-        return SearchStatsResponse(
+        search_stats = SearchStatsResponse(
             total_searches=total_searches,
-            avg_execution_time=float(avg_time),
+            avg_execution_time=float(avg_time or 0.0),
             top_queries=top_queries,
             searches_by_strategy=searches_by_strategy,
+            most_used_strategy=most_used_strategy,
             searches_over_time=searches_over_time
         )
 
+        # Keyed by minute, so an entry is never reused past its window
+        await response_cache.set(cache_key, search_stats.model_dump(), 60)
+
+        return search_stats
+
     except Exception as e:
         logger.error(f"Failed to get search stats: {str(e)}")
         raise HTTPException(
@@ -206,7 +276,7 @@ async def get_search_stats(
 
 @router.get("/content-intelligence", response_model=ContentIntelligenceResponse)
 async def get_content_intelligence(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get content intelligence analytics.
@@ -219,42 +289,46 @@ async def get_content_intelligence(
     """
     logger.info("Getting content intelligence analytics")
 
+    cached = await response_cache.get(CONTENT_INTELLIGENCE_CACHE_KEY)
+    if cached is not None:
+        return cached
+
     try:
-        # Language distribution
-        language_counts = db.query(
-            Document.language,
-            func.count(Document.id)
-        ).filter(
-            Document.language.isnot(None)
-        ).group_by(
-            Document.language
-        ).all()
+        language_rows = (await db.execute(_CONTENT_INTELLIGENCE_QUERY)).all()
 
+        # Most common first
         language_distribution = {
             lang: count
-            for lang, count in language_counts
+            for lang, count, _, _ in language_rows
             if lang
         }
 
-        # Average document length
-        avg_length = db.query(
-            func.avg(Document.word_count)
-        ).filter(
-            Document.word_count.isnot(None)
-        ).scalar() or 0.0
+        total_words = sum(words or 0 for _, _, words, _ in language_rows)
+        counted = sum(n for _, _, _, n in language_rows)
+        avg_length = total_words / counted if counted else 0.0
+        most_common_language = next(iter(language_distribution), None)
 
         # Placeholder for entities and topics
         # TODO: Implement proper entity and topic extraction
         top_entities = []
         top_topics = []
 
-        return ContentIntelligenceResponse(
+        content_intelligence = ContentIntelligenceResponse(
             top_entities=top_entities,
             top_topics=top_topics,
             language_distribution=language_distribution,
+            most_common_language=most_common_language,
             avg_document_length=float(avg_length)
         )
 
+        await response_cache.set(
+            CONTENT_INTELLIGENCE_CACHE_KEY,
+            content_intelligence.model_dump(),
+            settings.analytics_cache_ttl
+        )
+
+        return content_intelligence
+
     except Exception as e:
         logger.error(f"Failed to get content intelligence: {str(e)}")
         raise HTTPException(
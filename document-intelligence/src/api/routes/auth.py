@@ -5,7 +5,8 @@ Basic JWT-based authentication (stub implementation).
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -35,6 +36,19 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _user_to_response(user: User) -> UserResponse:
+    """Build a UserResponse from a loaded User row without re-validating it."""
+    return UserResponse.model_construct(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        full_name=user.full_name,
+        role=user.role.value,
+        is_active=user.is_active,
+        created_at=user.created_at
+    )
+
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     """Create JWT access token."""
     to_encode = data.copy()
@@ -53,7 +67,7 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
 @router.post("/register", response_model=UserResponse)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Register a new user.
@@ -69,9 +83,11 @@ async def register(
 
     try:
         # Check if user exists
-        existing_user = db.query(User).filter(
-            (User.username == user_data.username) | (User.email == user_data.email)
-        ).first()
+        existing_user = (await db.execute(
+            select(User).where(
+                (User.username == user_data.username) | (User.email == user_data.email)
+            ).limit(1)
+        )).scalars().first()
 
         if existing_user:
             raise HTTPException(
@@ -89,26 +105,18 @@ async def register(
         )
 
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
 
         logger.info(f"User registered successfully: {user.username}")
 
-        return UserResponse(
-            id=user.id,
-            username=user.username,
-            email=user.email,
-            full_name=user.full_name,
-            role=user.role.value,
-            is_active=user.is_active,
-            created_at=user.created_at
-        )
+        return _user_to_response(user)
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to register user: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to register user: {str(e)}"
@@ -118,7 +126,7 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Login and get access token.
@@ -134,7 +142,9 @@ async def login(
 
     try:
         # Find user
-        user = db.query(User).filter(User.username == form_data.username).first()
+        user = (await db.execute(
+            select(User).where(User.username == form_data.username)
+        )).scalars().first()
 
         if not user or not verify_password(form_data.password, user.hashed_password):
             raise HTTPException(
@@ -171,7 +181,7 @@ async def login(
 @router.get("/me", response_model=UserResponse)
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get current authenticated user.
@@ -199,17 +209,11 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.username == username).first()
+    user = (await db.execute(
+        select(User).where(User.username == username)
+    )).scalars().first()
 
     if user is None:
         raise credentials_exception
 
-    return UserResponse(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        full_name=user.full_name,
-        role=user.role.value,
-        is_active=user.is_active,
-        created_at=user.created_at
-    )
+    return _user_to_response(user)
@@ -3,34 +3,87 @@ Document management API endpoints.
 Handles upload, retrieval, and deletion of documents.
 """
 
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, func, select, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from pathlib import Path
-import shutil
+import base64
+import binascii
+import hashlib
 import uuid
 from datetime import datetime
 
-from src.core.database import get_db
+import aiofiles
+import aiofiles.os
+import orjson
+
+from src.core.cache import DOCUMENT_ANALYTICS_CACHE_KEYS, response_cache
+from src.core.database import AsyncSessionLocal, get_db
 from src.core.models import Document, DocumentType, ProcessingStatus, User
 from src.api.schemas import (
     DocumentResponse,
     DocumentListResponse,
     DocumentUploadResponse
 )
+from src.tasks import process_document
 from src.utils.logger import app_logger as logger
 from config.settings import settings
 
 router = APIRouter()
 
+# Read size for streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Largest page the document listing will return
+MAX_PAGE_SIZE = 1000
+
+# File extension -> document type, built once at import
+_EXT_TO_TYPE = {
+    'pdf': DocumentType.PDF,
+    'docx': DocumentType.DOCX,
+    'xlsx': DocumentType.XLSX,
+    'xls': DocumentType.XLSX,
+    'pptx': DocumentType.PPTX,
+    'png': DocumentType.IMAGE,
+    'jpg': DocumentType.IMAGE,
+    'jpeg': DocumentType.IMAGE,
+    'eml': DocumentType.EMAIL,
+    'msg': DocumentType.EMAIL,
+    'html': DocumentType.HTML,
+    'htm': DocumentType.HTML,
+    'md': DocumentType.MARKDOWN,
+    'markdown': DocumentType.MARKDOWN,
+    'txt': DocumentType.TEXT,
+}
+
+# Exactly the columns DocumentResponse needs, in _document_to_dict order
+_RESPONSE_COLUMNS = (
+    Document.id,
+    Document.original_filename,
+    Document.file_size,
+    Document.document_type,
+    Document.status,
+    Document.uploaded_at,
+    Document.processing_completed_at,
+    Document.page_count,
+    Document.word_count,
+    Document.extra_metadata,
+)
+
 
-@router.post("/upload", response_model=DocumentUploadResponse)
+@router.post("/upload", response_model=DocumentUploadResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_document(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Upload a single document for processing.
+    Upload a single document and queue it for processing.
+
+    Extraction runs on a Celery worker; poll GET /{document_id} for status.
 
     Args:
         file: Uploaded file
@@ -51,7 +104,7 @@ async def upload_document(
 
         # Validate file extension
         file_ext = Path(file.filename).suffix.lower().lstrip('.')
-        if file_ext not in settings.allowed_extensions_list:
+        if file_ext not in settings.allowed_extensions_set:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"File type .{file_ext} is not allowed. Allowed types: {', '.join(settings.allowed_extensions_list)}"
@@ -61,9 +114,22 @@ async def upload_document(
         unique_filename = f"{uuid.uuid4()}_{file.filename}"
         file_path = settings.upload_dir / unique_filename
 
-        # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Stream to disk without blocking the event loop, enforcing the
+        # size limit as bytes arrive rather than trusting the declared size
+        file_size = 0
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > settings.max_file_size_bytes:
+                    break
+                await buffer.write(chunk)
+
+        if file_size > settings.max_file_size_bytes:
+            await aiofiles.os.remove(file_path)
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File size exceeds maximum allowed size of {settings.max_file_size_mb}MB"
+            )
 
         # Determine document type
         doc_type = _get_document_type(file_ext)
@@ -73,19 +139,24 @@ async def upload_document(
             filename=unique_filename,
             original_filename=file.filename,
             file_path=str(file_path),
-            file_size=file.size or 0,
+            file_size=file_size,
             document_type=doc_type,
             status=ProcessingStatus.PENDING,
             user_id=1  # TODO: Get from auth
         )
 
         db.add(document)
-        db.commit()
-        db.refresh(document)
+        await db.commit()
+        await db.refresh(document)
+        await response_cache.invalidate(*DOCUMENT_ANALYTICS_CACHE_KEYS)
 
         logger.info(f"Document uploaded successfully: ID={document.id}")
 
-        # TODO: Trigger async processing task
+        # Hand extraction to a worker; the row stays PENDING if queueing fails
+        try:
+            await run_in_threadpool(process_document.delay, document.id)
+        except Exception as e:
+            logger.error(f"Failed to queue document {document.id} for processing: {str(e)}")
 
         return DocumentUploadResponse(
             id=document.id,
@@ -106,51 +177,108 @@ async def upload_document(
 
 @router.get("/", response_model=DocumentListResponse)
 async def list_documents(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     status_filter: Optional[str] = None,
-    type_filter: Optional[str] = None,
-    db: Session = Depends(get_db)
+    type_filter: Optional[str] = None
 ):
     """
-    List all documents with optional filtering.
+    List all documents with optional filtering, newest first.
+
+    Pass the previous page's next_cursor to seek straight to the next page;
+    unlike skip, its cost does not grow with page depth.
+
+    The response carries an ETag derived from the row count and the latest
+    update time of the matching documents; a request whose If-None-Match
+    equals it gets an empty 304 instead of the listing.
 
     Args:
-        skip: Number of records to skip
+        request: Incoming request, for If-None-Match
+        skip: Number of records to skip (ignored when cursor is given)
         limit: Maximum number of records to return
+        cursor: Opaque cursor from a previous page's next_cursor
         status_filter: Filter by processing status
         type_filter: Filter by document type
-        db: Database session
 
     Returns:
         List of documents
     """
-    logger.info(f"Listing documents: skip={skip}, limit={limit}")
+    logger.info(f"Listing documents: skip={skip}, limit={limit}, cursor={cursor}")
 
-    try:
-        query = db.query(Document)
+    if cursor is not None:
+        try:
+            after = _decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
+    # The body streams after this handler returns, so the session is owned
+    # here and handed to the stream rather than taken from get_db, whose
+    # cleanup may run before the response is sent
+    db = AsyncSessionLocal()
 
+    try:
         # Apply filters
+        conditions = []
         if status_filter:
-            query = query.filter(Document.status == status_filter)
+            conditions.append(Document.status == status_filter)
 
         if type_filter:
-            query = query.filter(Document.document_type == type_filter)
-
-        # Get total count
-        total = query.count()
-
-        # Get documents
-        documents = query.order_by(Document.uploaded_at.desc()).offset(skip).limit(limit).all()
-
-        return DocumentListResponse(
-            total=total,
-            skip=skip,
-            limit=limit,
-            documents=[_document_to_response(doc) for doc in documents]
+            conditions.append(Document.document_type == type_filter)
+
+        # Fingerprint the matching rows; inserts, deletes and status updates
+        # all change either the count or the latest updated_at
+        fingerprint = select(
+            func.count(Document.id).label('total'),
+            func.max(Document.updated_at).label('last_updated')
+        ).where(*conditions).subquery()
+
+        # Get documents as plain rows, skipping ORM identity-map hydration.
+        # (uploaded_at, id) is unique and matches idx_doc_uploaded_desc, so
+        # a cursor seeks through the index instead of discarding rows.
+        page = select(*_RESPONSE_COLUMNS).where(*conditions).order_by(
+            Document.uploaded_at.desc(), Document.id.desc()
+        )
+        if cursor is not None:
+            page = page.where(tuple_(Document.uploaded_at, Document.id) < tuple_(*after))
+        else:
+            page = page.offset(skip)
+
+        # One extra row tells us whether another page follows
+        page = page.limit(limit + 1).lateral()
+
+        # Fingerprint and page in one round-trip; the outer join keeps the
+        # fingerprint row even when the page is empty. Rows are streamed from
+        # a server-side cursor so large pages never sit in memory at once.
+        result = await db.stream(
+            select(fingerprint.c.total, fingerprint.c.last_updated, *page.c)
+            .select_from(fingerprint.outerjoin(page, true()))
+            .order_by(page.c.uploaded_at.desc(), page.c.id.desc())
+        )
+        first = await result.fetchone()
+
+        total, last_updated = first[:2]
+
+        etag = _listing_etag(total, last_updated, skip, limit, cursor, status_filter, type_filter)
+        if request.headers.get("if-none-match") == etag:
+            await result.close()
+            await db.close()
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        # Rows come straight from our own table, so skip re-validating them
+        # through DocumentListResponse and encode each one as it arrives
+        return StreamingResponse(
+            _stream_listing(db, result, first, total, skip, limit),
+            media_type="application/json",
+            headers={"ETag": etag}
         )
 
     except Exception as e:
+        await db.close()
         logger.error(f"Failed to list documents: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -161,7 +289,7 @@ async def list_documents(
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get document details by ID.
@@ -176,15 +304,17 @@ async def get_document(
     logger.info(f"Getting document: ID={document_id}")
 
     try:
-        document = db.query(Document).filter(Document.id == document_id).first()
+        row = (await db.execute(
+            select(*_RESPONSE_COLUMNS).where(Document.id == document_id)
+        )).first()
 
-        if not document:
+        if row is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Document with ID {document_id} not found"
             )
 
-        return _document_to_response(document)
+        return _document_to_dict(row)
 
     except HTTPException:
         raise
@@ -199,7 +329,7 @@ async def get_document(
 @router.delete("/{document_id}")
 async def delete_document(
     document_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a document.
@@ -214,7 +344,9 @@ async def delete_document(
     logger.info(f"Deleting document: ID={document_id}")
 
     try:
-        document = db.query(Document).filter(Document.id == document_id).first()
+        # Chunks are deleted by cascade; load them up front since an
+        # AsyncSession cannot lazy-load during the flush
+        document = await db.get(Document, document_id, options=[selectinload(Document.chunks)])
 
         if not document:
             raise HTTPException(
@@ -231,8 +363,9 @@ async def delete_document(
             logger.warning(f"Failed to delete file: {str(e)}")
 
         # Delete from database
-        db.delete(document)
-        db.commit()
+        await db.delete(document)
+        await db.commit()
+        await response_cache.invalidate(*DOCUMENT_ANALYTICS_CACHE_KEYS)
 
         logger.info(f"Document deleted successfully: ID={document_id}")
 
@@ -242,47 +375,108 @@ async def delete_document(
         raise
     except Exception as e:
         logger.error(f"Failed to delete document: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete document: {str(e)}"
         )
 
 
+def _listing_etag(*parts) -> str:
+    """Build a weak ETag for a document listing from its fingerprint parts."""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+async def _stream_listing(
+    db: AsyncSession,
+    result: AsyncResult,
+    first: Row,
+    total: int,
+    skip: int,
+    limit: int
+) -> AsyncIterator[bytes]:
+    """
+    Encode a DocumentListResponse body row by row.
+
+    Args:
+        db: Session the rows are read through; closed when done
+        result: Streamed listing rows, fingerprint columns first
+        first: Row already read from `result`
+        total: Number of matching documents
+        skip: Requested skip
+        limit: Requested page size; one extra row signals a next page
+
+    Yields:
+        Chunks of the JSON body
+    """
+    try:
+        yield orjson.dumps({"total": total, "skip": skip, "limit": limit})[:-1] + b',"documents":['
+
+        next_cursor = None
+        last = None
+        sent = 0
+        row = first
+
+        while row is not None and row.id is not None:
+            if sent == limit:
+                if last is not None:
+                    next_cursor = _encode_cursor(last.uploaded_at, last.id)
+                break
+
+            yield (b',' if sent else b'') + orjson.dumps(_document_to_dict(row[2:]))
+            last = row
+            sent += 1
+            row = await result.fetchone()
+
+        yield b'],"next_cursor":' + orjson.dumps(next_cursor) + b'}'
+
+    finally:
+        await result.close()
+        await db.close()
+
+
+def _encode_cursor(uploaded_at: datetime, document_id: int) -> str:
+    """Encode a listing position as an opaque cursor."""
+    raw = f"{uploaded_at.isoformat()}|{document_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by _encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError("Malformed cursor") from e
+
+    uploaded_at, _, document_id = raw.partition("|")
+    return datetime.fromisoformat(uploaded_at), int(document_id)
+
+
 def _get_document_type(extension: str) -> DocumentType:
     """Map file extension to DocumentType enum."""
-    type_map = {
-        'pdf': DocumentType.PDF,
-        'docx': DocumentType.DOCX,
-        'xlsx': DocumentType.XLSX,
-        'xls': DocumentType.XLSX,
-        'pptx': DocumentType.PPTX,
-        'png': DocumentType.IMAGE,
-        'jpg': DocumentType.IMAGE,
-        'jpeg': DocumentType.IMAGE,
-        'eml': DocumentType.EMAIL,
-        'msg': DocumentType.EMAIL,
-        'html': DocumentType.HTML,
-        'htm': DocumentType.HTML,
-        'md': DocumentType.MARKDOWN,
-        'markdown': DocumentType.MARKDOWN,
-        'txt': DocumentType.TEXT,
+    return _EXT_TO_TYPE.get(extension, DocumentType.OTHER)
+
+
+def _document_to_dict(row: Row) -> Dict[str, Any]:
+    """Convert a row selected with _RESPONSE_COLUMNS to DocumentResponse fields."""
+    (doc_id, filename, file_size, doc_type, doc_status, uploaded_at,
+     completed_at, page_count, word_count, metadata) = row
+
+    return {
+        "id": doc_id,
+        "filename": filename,
+        "file_size": file_size,
+        "document_type": doc_type.value,
+        "status": doc_status.value,
+        "uploaded_at": uploaded_at,
+        "processing_completed_at": completed_at,
+        "page_count": page_count,
+        "word_count": word_count,
+        "metadata": metadata or {}
     }
-
-    return type_map.get(extension, DocumentType.OTHER)
-
-
-def _document_to_response(document: Document) -> DocumentResponse:
-    """Convert Document model to response schema."""
-    return DocumentResponse(
-        id=document.id,
-        filename=document.original_filename,
-        file_size=document.file_size,
-        document_type=document.document_type.value,
-        status=document.status.value,
-        uploaded_at=document.uploaded_at,
-        processing_completed_at=document.processing_completed_at,
-        page_count=document.page_count,
-        word_count=document.word_count,
-        metadata=document.metadata or {}
-    )
@@ -3,13 +3,13 @@ Search and RAG API endpoints.
 Handles hybrid search and question answering.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from typing import Any, Dict, Optional, Tuple
 import time
 
-from src.core.database import get_db
-from src.core.models import SearchHistory
+from src.core.search_history import search_history_writer
 from src.api.schemas import (
     SearchRequest,
     SearchResponse,
@@ -29,17 +29,54 @@ from src.utils.logger import app_logger as logger
 router = APIRouter()
 
 
+def _snippet(content: str, length: Optional[int]) -> Tuple[str, bool]:
+    """Truncate content to the requested snippet length."""
+    if length is None or len(content) <= length:
+        return content, False
+    return content[:length], True
+
+
+def _json_response(model: BaseModel) -> ORJSONResponse:
+    """
+    Serialize an already-built response model directly.
+
+    Returning a Response stops FastAPI from dumping the model and
+    validating it again against response_model before encoding it.
+    """
+    return ORJSONResponse(content=model.model_dump())
+
+
+def _build_filter(
+    document_type: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """Build the vector-store metadata filter, or None when nothing is filtered."""
+    if not (document_type or date_from or date_to):
+        return None
+
+    filter_dict: Dict[str, Any] = {}
+    if document_type:
+        filter_dict['document_type'] = document_type
+    if date_from or date_to:
+        date_range = {}
+        if date_from:
+            date_range['$gte'] = date_from
+        if date_to:
+            date_range['$lte'] = date_to
+        filter_dict['date'] = date_range
+    return filter_dict
+
+
 @router.post("/", response_model=SearchResponse)
 async def search(
-    request: SearchRequest,
-    db: Session = Depends(get_db)
+    request: SearchRequest
 ):
     """
     Perform document search using various strategies.
 
     Args:
         request: Search request parameters
-        db: Database session
 
     Returns:
         Search results
@@ -49,18 +86,7 @@ async def search(
     start_time = time.time()
 
     try:
-        # Build metadata filter
-        filter_dict = None
-        if request.document_type or request.date_from or request.date_to:
-            filter_dict = {}
-            if request.document_type:
-                filter_dict['document_type'] = request.document_type
-            if request.date_from or request.date_to:
-                filter_dict['date'] = {}
-                if request.date_from:
-                    filter_dict['date']['$gte'] = request.date_from
-                if request.date_to:
-                    filter_dict['date']['$lte'] = request.date_to
+        filter_dict = _build_filter(request.document_type, request.date_from, request.date_to)
 
         # Perform search based on strategy
         if request.strategy == "vector":
@@ -93,44 +119,43 @@ async def search(
 
         execution_time = time.time() - start_time
 
-        # Log search to history
-        try:
-            search_history = SearchHistory(
-                user_id=1,  # TODO: Get from auth
-                query=request.query,
-                query_type=request.strategy,
-                search_params={
-                    "top_k": request.top_k,
-                    "filters": filter_dict
-                },
-                results_count=len(results),
-                top_result_score=results[0].score if results else 0.0,
-                execution_time_ms=execution_time * 1000
-            )
-            db.add(search_history)
-            db.commit()
-        except Exception as e:
-            logger.warning(f"Failed to log search history: {str(e)}")
-
-        # Convert results to response format
-        result_items = [
-            SearchResultItem(
-                id=r.id,
-                score=r.score,
-                content=r.content,
-                document_id=r.document_id,
-                metadata=r.metadata
+        # Log search to history (written in the background)
+        search_history_writer.record(
+            user_id=1,  # TODO: Get from auth
+            query=request.query,
+            query_type=request.strategy,
+            search_params={
+                "top_k": request.top_k,
+                "filters": filter_dict
+            },
+            results_count=len(results),
+            top_result_score=results[0].score if results else 0.0,
+            execution_time_ms=execution_time * 1000
+        )
+
+        # Convert results to response format; our own retrievers built
+        # these values, so skip per-field validation
+        result_items = []
+        for r in results:
+            content, truncated = _snippet(r.content, request.snippet_length)
+            result_items.append(
+                SearchResultItem.model_construct(
+                    id=r.id,
+                    score=r.score,
+                    content=content,
+                    content_truncated=truncated,
+                    document_id=r.document_id,
+                    metadata=r.metadata
+                )
             )
-            for r in results
-        ]
 
-        return SearchResponse(
+        return _json_response(SearchResponse(
             query=request.query,
             results=result_items,
             total_results=len(results),
             strategy=request.strategy,
             execution_time=execution_time
-        )
+        ))
 
     except Exception as e:
         logger.error(f"Search failed: {str(e)}")
@@ -142,15 +167,13 @@ async def search(
 
 @router.post("/query", response_model=RAGQueryResponse)
 async def rag_query(
-    request: RAGQueryRequest,
-    db: Session = Depends(get_db)
+    request: RAGQueryRequest
 ):
     """
     Answer questions using RAG.
 
     Args:
         request: RAG query request
-        db: Database session
 
     Returns:
         Answer with sources
@@ -158,18 +181,7 @@ async def rag_query(
     logger.info(f"RAG query: question='{request.question[:50]}...', strategy={request.strategy}")
 
     try:
-        # Build metadata filter
-        filter_dict = None
-        if request.document_type or request.date_from or request.date_to:
-            filter_dict = {}
-            if request.document_type:
-                filter_dict['document_type'] = request.document_type
-            if request.date_from or request.date_to:
-                filter_dict['date'] = {}
-                if request.date_from:
-                    filter_dict['date']['$gte'] = request.date_from
-                if request.date_to:
-                    filter_dict['date']['$lte'] = request.date_to
+        filter_dict = _build_filter(request.document_type, request.date_from, request.date_to)
 
         # Perform RAG query
         result = rag_chain.query(
@@ -179,45 +191,43 @@ async def rag_query(
             filter=filter_dict
         )
 
-        # Log query to history
-        try:
-            search_history = SearchHistory(
-                user_id=1,  # TODO: Get from auth
-                query=request.question,
-                query_type=f"rag_{request.strategy}",
-                search_params={
-                    "top_k": request.top_k,
-                    "filters": filter_dict
-                },
-                results_count=result['num_sources'],
-                top_result_score=result['confidence'],
-                execution_time_ms=result['execution_time'] * 1000
-            )
-            db.add(search_history)
-            db.commit()
-        except Exception as e:
-            logger.warning(f"Failed to log query history: {str(e)}")
-
-        # Convert sources to response format
-        source_items = [
-            SourceItem(
-                number=s['number'],
-                content=s['content'],
-                score=s['score'],
-                document_id=s.get('document_id'),
-                metadata=s['metadata']
+        # Log query to history (written in the background)
+        search_history_writer.record(
+            user_id=1,  # TODO: Get from auth
+            query=request.question,
+            query_type=f"rag_{request.strategy}",
+            search_params={
+                "top_k": request.top_k,
+                "filters": filter_dict
+            },
+            results_count=result['num_sources'],
+            top_result_score=result['confidence'],
+            execution_time_ms=result['execution_time'] * 1000
+        )
+
+        # Convert sources to response format, skipping per-field validation
+        source_items = []
+        for s in result['sources']:
+            content, truncated = _snippet(s['content'], request.snippet_length)
+            source_items.append(
+                SourceItem.model_construct(
+                    number=s['number'],
+                    content=content,
+                    content_truncated=truncated,
+                    score=s['score'],
+                    document_id=s.get('document_id'),
+                    metadata=s['metadata']
+                )
             )
-            for s in result['sources']
-        ]
 
-        return RAGQueryResponse(
+        return _json_response(RAGQueryResponse(
             answer=result['answer'],
             sources=source_items,
             confidence=result['confidence'],
             num_sources=result['num_sources'],
             retrieval_strategy=result['retrieval_strategy'],
             execution_time=result['execution_time']
-        )
+        ))
 
     except Exception as e:
         logger.error(f"RAG query failed: {str(e)}")
@@ -2,13 +2,29 @@
 Pydantic schemas for API request/response validation.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 
+class _ResponseModel(BaseModel):
+    """
+    Base for outbound schemas.
+
+    Responses are built once from trusted data and never mutated, so they
+    are frozen, and nested model instances are passed through as-is rather
+    than revalidated.
+    """
+    model_config = ConfigDict(
+        frozen=True,
+        extra='ignore',
+        revalidate_instances='never',
+        from_attributes=True
+    )
+
+
 # Document schemas
-class DocumentResponse(BaseModel):
+class DocumentResponse(_ResponseModel):
     """Document response schema."""
     id: int
     filename: str
@@ -21,11 +37,8 @@ class DocumentResponse(BaseModel):
     word_count: Optional[int] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
-    class Config:
-        from_attributes = True
-
 
-class DocumentUploadResponse(BaseModel):
+class DocumentUploadResponse(_ResponseModel):
     """Document upload response schema."""
     id: int
     filename: str
@@ -33,11 +46,12 @@ class DocumentUploadResponse(BaseModel):
     message: str
 
 
-class DocumentListResponse(BaseModel):
+class DocumentListResponse(_ResponseModel):
     """Document list response schema."""
     total: int
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
     documents: List[DocumentResponse]
 
 
@@ -53,18 +67,20 @@ class SearchRequest(BaseModel):
     document_type: Optional[str] = Field(None, description="Filter by document type")
     date_from: Optional[str] = Field(None, description="Filter by date (YYYY-MM-DD)")
     date_to: Optional[str] = Field(None, description="Filter by date (YYYY-MM-DD)")
+    snippet_length: Optional[int] = Field(None, ge=1, description="Truncate result content to this many characters")
 
 
-class SearchResultItem(BaseModel):
+class SearchResultItem(_ResponseModel):
     """Single search result."""
     id: str
     score: float
     content: str
+    content_truncated: bool = False
     document_id: Optional[int] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
-class SearchResponse(BaseModel):
+class SearchResponse(_ResponseModel):
     """Search response schema."""
     query: str
     results: List[SearchResultItem]
@@ -85,18 +101,20 @@ class RAGQueryRequest(BaseModel):
     document_type: Optional[str] = None
     date_from: Optional[str] = None
     date_to: Optional[str] = None
+    snippet_length: Optional[int] = Field(None, ge=1, description="Truncate source content to this many characters")
 
 
-class SourceItem(BaseModel):
+class SourceItem(_ResponseModel):
     """Source document item."""
     number: int
     content: str
+    content_truncated: bool = False
     score: float
     document_id: Optional[int] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
-class RAGQueryResponse(BaseModel):
+class RAGQueryResponse(_ResponseModel):
     """RAG query response schema."""
     answer: str
     sources: List[SourceItem]
@@ -107,7 +125,7 @@ class RAGQueryResponse(BaseModel):
 
 
 # Analytics schemas
-class DocumentOverviewResponse(BaseModel):
+class DocumentOverviewResponse(_ResponseModel):
     """Document overview analytics."""
     total_documents: int
     documents_by_type: Dict[str, int]
@@ -117,25 +135,27 @@ class DocumentOverviewResponse(BaseModel):
     avg_processing_time: Optional[float] = None
 
 
-class SearchStatsResponse(BaseModel):
+class SearchStatsResponse(_ResponseModel):
     """Search statistics."""
     total_searches: int
     avg_execution_time: float
     top_queries: List[Dict[str, Any]]
     searches_by_strategy: Dict[str, int]
+    most_used_strategy: Optional[str] = None
     searches_over_time: List[Dict[str, Any]]
 
 
-class ContentIntelligenceResponse(BaseModel):
+class ContentIntelligenceResponse(_ResponseModel):
     """Content intelligence analytics."""
     top_entities: List[Dict[str, Any]]
     top_topics: List[Dict[str, Any]]
     language_distribution: Dict[str, int]
+    most_common_language: Optional[str] = None
     avg_document_length: float
 
 
 # Auth schemas
-class Token(BaseModel):
+class Token(_ResponseModel):
     """JWT token response."""
     access_token: str
     token_type: str = "bearer"
@@ -154,7 +174,7 @@ class UserCreate(BaseModel):
     full_name: Optional[str] = None
 
 
-class UserResponse(BaseModel):
+class UserResponse(_ResponseModel):
     """User response schema."""
     id: int
     username: str
@@ -164,9 +184,6 @@ class UserResponse(BaseModel):
     is_active: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class UserLogin(BaseModel):
     """User login schema."""
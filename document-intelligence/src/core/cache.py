@@ -0,0 +1,103 @@
+"""
+Redis-backed response cache.
+Short-lived caching of expensive API responses, shared across workers.
+"""
+
+from typing import Any, Optional
+
+import orjson
+from redis.asyncio import ConnectionPool, Redis
+
+from config.settings import settings
+from src.utils.logger import app_logger as logger
+
+# Keys for analytics responses derived from the documents table
+OVERVIEW_CACHE_KEY = "analytics:overview"
+CONTENT_INTELLIGENCE_CACHE_KEY = "analytics:content-intelligence"
+DOCUMENT_ANALYTICS_CACHE_KEYS = (OVERVIEW_CACHE_KEY, CONTENT_INTELLIGENCE_CACHE_KEY)
+
+# Search stats share a window for a minute at a time; format with days and minute
+SEARCH_STATS_CACHE_KEY = "analytics:search-stats:{days}:{minute}"
+
+
+class ResponseCache:
+    """Async Redis cache for JSON-serializable API responses."""
+
+    def __init__(self):
+        """Initialize without connecting; call connect() on startup."""
+        self.pool: Optional[ConnectionPool] = None
+        self.client: Optional[Redis] = None
+
+    async def connect(self):
+        """Create the connection pool."""
+        self.pool = ConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=settings.redis_max_connections
+        )
+        self.client = Redis(connection_pool=self.pool)
+        logger.info("Response cache connected")
+
+    async def close(self):
+        """Release the connection pool."""
+        if self.client is not None:
+            await self.client.aclose()
+            await self.pool.disconnect()
+            self.client = None
+            self.pool = None
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Decoded value, or None on a miss or when Redis is unavailable
+        """
+        if self.client is None:
+            return None
+
+        try:
+            raw = await self.client.get(key)
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}: {str(e)}")
+            return None
+
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int):
+        """
+        Cache a value.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ttl: Time to live in seconds
+        """
+        if self.client is None:
+            return
+
+        try:
+            await self.client.set(key, orjson.dumps(value), ex=ttl)
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {str(e)}")
+
+    async def invalidate(self, *keys: str):
+        """
+        Drop cached values.
+
+        Args:
+            keys: Cache keys to delete
+        """
+        if self.client is None or not keys:
+            return
+
+        try:
+            await self.client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed for {keys}: {str(e)}")
+
+
+# Global response cache instance
+response_cache = ResponseCache()
@@ -2,37 +2,90 @@
 Database configuration and session management.
 """
 
+from uuid import uuid4
+
+import orjson
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from config.settings import settings
 
-# Create database engine
+
+def _async_database_url(url: str) -> str:
+    """Point a PostgreSQL URL at the asyncpg driver."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed.render_as_string(hide_password=False)
+
+
+def _json_serializer(value) -> str:
+    """
+    Serialize JSON/JSONB column values.
+
+    Extracted metadata carries datetimes (file and document properties),
+    which become ISO 8601 strings; anything else orjson can't encode is
+    stored as its str().
+    """
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Create database engine (used for schema creation and sync scripts)
 engine = create_engine(
     settings.database_url,
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
     pool_pre_ping=True,  # Verify connections before using
     echo=settings.debug,  # Log SQL queries in debug mode
+    json_serializer=_json_serializer,
+)
+
+# Async engine used by the API request handlers. Behind PgBouncer in
+# transaction mode the bouncer owns pooling, and server-side prepared
+# statements cannot survive across transactions, so both caches are
+# disabled here. Statements asyncpg still prepares get unique names, as
+# its default per-connection counter collides on shared server connections.
+if settings.database_pgbouncer:
+    _async_pool_options = {
+        "poolclass": NullPool,
+        "connect_args": {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+else:
+    _async_pool_options = {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_pre_ping": True,
+    }
+
+async_engine = create_async_engine(
+    _async_database_url(settings.database_url),
+    echo=settings.debug,
+    json_serializer=_json_serializer,
+    **_async_pool_options,
 )
 
-# Session factory
+# Session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+async def get_db():
     """
-    Dependency for getting database sessions.
+    Dependency for getting async database sessions.
     Used in FastAPI endpoints.
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 def init_db():
@@ -3,20 +3,207 @@ Embedding generation service using OpenAI.
 Handles batch processing and caching of embeddings.
 """
 
-from typing import List, Union
-from openai import OpenAI
+import asyncio
+import functools
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Union
+import numpy as np
+from openai import APITimeoutError, AsyncOpenAI, OpenAI, RateLimitError
+from redis import Redis
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 from config.settings import settings
+from src.core.vector_store import get_vector_store
 from src.utils.logger import app_logger as logger
 
 
+# Native output size of each embedding model
+MODEL_DIMENSIONS = {
+    "text-embedding-3-large": 3072,
+    "text-embedding-3-small": 1536,
+    "text-embedding-ada-002": 1536,
+}
+
+# text-embedding-3 models can return shortened vectors directly; we ask
+# for that whenever the index is smaller than the model's output
+_NATIVE_DIMENSION = MODEL_DIMENSIONS.get(settings.openai_embedding_model, settings.pinecone_dimension)
+SHORTEN_EMBEDDINGS = (
+    settings.openai_embedding_model.startswith("text-embedding-3-")
+    and settings.pinecone_dimension < _NATIVE_DIMENSION
+)
+
+# Any other mismatch would have every upsert rejected by the index
+if settings.pinecone_dimension != _NATIVE_DIMENSION and not SHORTEN_EMBEDDINGS:
+    raise ValueError(
+        f"PINECONE_DIMENSION={settings.pinecone_dimension} doesn't match "
+        f"{settings.openai_embedding_model}, which returns {_NATIVE_DIMENSION}-dimensional "
+        f"vectors; only text-embedding-3 models can be shortened, and only to a smaller size"
+    )
+
+# Length of every vector the service returns, known at import time
+EMBEDDING_DIMENSION = settings.pinecone_dimension
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache.
+
+    Vectors are keyed by SHA-256 of (model, text) and kept in a bounded
+    in-process LRU, backed by Redis so workers share what any of them
+    has already embedded.
+    """
+
+    def __init__(self, model: str):
+        """
+        Initialize cache for one embedding model.
+
+        Args:
+            model: Embedding model name, part of every key
+        """
+        self.model = model
+        self.memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.redis = Redis.from_url(settings.redis_url)
+
+    def key(self, text: str) -> str:
+        """Cache key for a text under this model."""
+        digest = hashlib.sha256(f"{self.model}\x00{text}".encode()).hexdigest()
+        return f"emb:{self.model}:{digest}"
+
+    def get_many(self, keys: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up embeddings, memory first, then Redis in one round-trip.
+
+        Args:
+            keys: Keys from key()
+
+        Returns:
+            Embedding or None for each key, in order
+        """
+        found: List[Optional[List[float]]] = [self.memory.get(k) for k in keys]
+        for k in keys:
+            if k in self.memory:
+                self.memory.move_to_end(k)
+
+        missing = [i for i, vector in enumerate(found) if vector is None]
+        if not missing:
+            return found
+
+        try:
+            raw = self.redis.mget([keys[i] for i in missing])
+        except Exception as e:
+            logger.warning(f"Embedding cache read failed: {str(e)}")
+            return found
+
+        for i, blob in zip(missing, raw):
+            if blob is not None:
+                found[i] = np.frombuffer(blob, dtype=np.float32).tolist()
+                self._remember(keys[i], found[i])
+
+        return found
+
+    def set_many(self, items: Dict[str, List[float]]):
+        """
+        Store embeddings in memory and Redis.
+
+        Args:
+            items: Key -> embedding
+        """
+        for k, vector in items.items():
+            self._remember(k, vector)
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for k, vector in items.items():
+                pipe.set(
+                    k,
+                    np.asarray(vector, dtype=np.float32).tobytes(),
+                    ex=settings.embedding_cache_ttl
+                )
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {str(e)}")
+
+    def _remember(self, key: str, vector: List[float]):
+        """Insert into the in-memory LRU, evicting the oldest entry if full."""
+        self.memory[key] = vector
+        self.memory.move_to_end(key)
+        if len(self.memory) > settings.embedding_cache_size:
+            self.memory.popitem(last=False)
+
+
+class TokenBucket:
+    """
+    Client-side tokens-per-minute budget for the embeddings endpoint.
+
+    Requests reserve their estimated tokens up front and sleep off any
+    deficit, so concurrent batches pace themselves instead of all hitting
+    429 together. The budget tracks OpenAI's x-ratelimit-* headers.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        """
+        Initialize a full bucket.
+
+        Args:
+            tokens_per_minute: Budget to assume until the API reports its own
+        """
+        self.capacity = float(tokens_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    async def acquire(self, tokens: int):
+        """
+        Reserve tokens, waiting until the budget covers them.
+
+        Args:
+            tokens: Estimated tokens for the request
+        """
+        self._refill()
+        self.tokens -= min(tokens, self.capacity)
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.capacity * 60)
+
+    def observe(self, headers):
+        """
+        Sync the budget with the limits OpenAI reported for a response.
+
+        Args:
+            headers: Response headers
+        """
+        limit = headers.get("x-ratelimit-limit-tokens")
+        remaining = headers.get("x-ratelimit-remaining-tokens")
+
+        self._refill()
+        if limit is not None:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.tokens = min(self.tokens, float(remaining))
+
+    def _refill(self):
+        """Credit tokens for the time elapsed since the last update."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+
+
 class EmbeddingService:
     """Service for generating embeddings using OpenAI."""
 
     def __init__(self):
-        """Initialize OpenAI client."""
+        """Initialize OpenAI client and embedding cache."""
         self.client = OpenAI(api_key=settings.openai_api_key)
         self.model = settings.openai_embedding_model
 
+        self.request_options = {}
+        if SHORTEN_EMBEDDINGS:
+            self.request_options["dimensions"] = EMBEDDING_DIMENSION
+
+        self.token_bucket = TokenBucket(settings.embedding_tokens_per_minute)
+
+        cache_namespace = f"{self.model}@{settings.pinecone_dimension}"
+        self.cache = EmbeddingCache(cache_namespace) if settings.embedding_cache_enabled else None
+
     def generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for a single text.
@@ -27,16 +214,28 @@ class EmbeddingService:
         Returns:
             Embedding vector
         """
+        if self.cache is not None:
+            key = self.cache.key(text)
+            cached = self.cache.get_many([key])[0]
+            if cached is not None:
+                return cached
+
         try:
             response = self.client.embeddings.create(
                 input=text,
-                model=self.model
+                model=self.model,
+                **self.request_options
             )
-            return response.data[0].embedding
+            embedding = response.data[0].embedding
         except Exception as e:
             logger.error(f"Failed to generate embedding: {str(e)}")
             raise
 
+        if self.cache is not None:
+            self.cache.set_many({key: embedding})
+
+        return embedding
+
     def generate_embeddings_batch(
         self,
         texts: List[str],
@@ -45,6 +244,9 @@ class EmbeddingService:
         """
         Generate embeddings for multiple texts in batches.
 
+        Blocking wrapper around agenerate_embeddings_batch; call that
+        directly from async code.
+
         Args:
             texts: List of texts to embed
             batch_size: Number of texts per batch (max 100 for OpenAI)
@@ -52,45 +254,203 @@ class EmbeddingService:
         Returns:
             List of embedding vectors
         """
-        all_embeddings = []
+        return asyncio.run(self.agenerate_embeddings_batch(texts, batch_size))
 
+    async def agenerate_embeddings_batch(
+        self,
+        texts: List[str],
+        batch_size: int = 100
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for multiple texts, sending batches concurrently.
+
+        At most settings.embedding_max_concurrency requests are in flight
+        at once. Texts already in the embedding cache are not sent.
+
+        Args:
+            texts: List of texts to embed
+            batch_size: Number of texts per batch (max 100 for OpenAI)
+
+        Returns:
+            List of embedding vectors, in input order
+        """
+        # A fresh client per call: its connection pool is tied to the
+        # running event loop, and the sync wrapper starts a new one each time
+        client = AsyncOpenAI(api_key=settings.openai_api_key)
         try:
-            # Process in batches
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
-                logger.info(f"Processing batch {i // batch_size + 1}/{(len(texts) - 1) // batch_size + 1}")
-
-                response = self.client.embeddings.create(
-                    input=batch,
-                    model=self.model
+            return await self._agenerate(client, texts, batch_size)
+        finally:
+            await client.close()
+
+    async def embed_and_upsert_stream(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+        namespace: str = "",
+        pinecone_batch: int = 100,
+        queue_size: int = 4
+    ) -> Dict[str, Any]:
+        """
+        Embed texts and upsert them to Pinecone as a pipeline.
+
+        One batch is upserted while the next is being embedded, and at most
+        queue_size embedded batches wait in memory; embedding pauses when
+        upserts fall behind.
+
+        Args:
+            texts: Texts to embed
+            metadatas: Metadata for each vector
+            ids: Vector IDs
+            namespace: Optional namespace for multi-tenancy
+            pinecone_batch: Texts per embedding batch and upsert request
+            queue_size: Embedded batches allowed to wait for upsert
+
+        Returns:
+            Upsert summary with the total upserted_count
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        upserted_count = 0
+
+        async def produce():
+            for i in range(0, len(texts), pinecone_batch):
+                embeddings = await self._agenerate(client, texts[i:i + pinecone_batch], pinecone_batch)
+                await queue.put((
+                    ids[i:i + pinecone_batch],
+                    np.asarray(embeddings, dtype=np.float32),
+                    metadatas[i:i + pinecone_batch]
+                ))
+            await queue.put(None)
+
+        async def consume():
+            nonlocal upserted_count
+            while (item := await queue.get()) is not None:
+                batch_ids, vectors, batch_metadatas = item
+                result = await asyncio.to_thread(
+                    get_vector_store().upsert_vectors,
+                    batch_ids,
+                    vectors,
+                    batch_metadatas,
+                    namespace,
+                    pinecone_batch
                 )
+                upserted_count += result["upserted_count"]
+
+        client = AsyncOpenAI(api_key=settings.openai_api_key)
+        tasks = [asyncio.create_task(produce()), asyncio.create_task(consume())]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            # The surviving side would otherwise wait on the queue forever
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            logger.error(f"Failed to embed and upsert {len(texts)} texts: {str(e)}")
+            raise
+        finally:
+            await client.close()
+
+        logger.info(f"Embedded and upserted {upserted_count} vectors")
+        return {"upserted_count": upserted_count}
+
+    async def _agenerate(
+        self,
+        client: AsyncOpenAI,
+        texts: List[str],
+        batch_size: int
+    ) -> List[List[float]]:
+        """Embed texts with the given client; see agenerate_embeddings_batch."""
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        keys: List[str] = []
+
+        if self.cache is not None:
+            keys = [self.cache.key(text) for text in texts]
+            embeddings = await asyncio.to_thread(self.cache.get_many, keys)
+
+        # Embed each distinct missing text once
+        pending: Dict[str, List[int]] = {}
+        for i, (text, embedding) in enumerate(zip(texts, embeddings)):
+            if embedding is None:
+                pending.setdefault(text, []).append(i)
+
+        if not pending:
+            logger.info(f"All {len(texts)} embeddings served from cache")
+            return embeddings
 
-                # Extract embeddings in order
-                batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
+        misses = list(pending)
+        batches = [misses[i:i + batch_size] for i in range(0, len(misses), batch_size)]
+        semaphore = asyncio.Semaphore(settings.embedding_max_concurrency)
 
-            logger.info(f"Generated {len(all_embeddings)} embeddings")
-            return all_embeddings
+        logger.info(f"Processing {len(batches)} embedding batches")
 
+        try:
+            results = await asyncio.gather(
+                *(self._embed_batch(client, batch, semaphore) for batch in batches)
+            )
         except Exception as e:
             logger.error(f"Failed to generate batch embeddings: {str(e)}")
             raise
 
+        fresh = [embedding for batch in results for embedding in batch]
+        for text, embedding in zip(misses, fresh):
+            for i in pending[text]:
+                embeddings[i] = embedding
+
+        if self.cache is not None:
+            new_entries = {keys[pending[text][0]]: embedding for text, embedding in zip(misses, fresh)}
+            await asyncio.to_thread(self.cache.set_many, new_entries)
+
+        logger.info(f"Generated {len(fresh)} embeddings ({len(texts) - len(fresh)} reused)")
+        return embeddings
+
+    @retry(
+        retry=retry_if_exception_type((RateLimitError, APITimeoutError)),
+        wait=wait_exponential_jitter(initial=1, max=30),
+        stop=stop_after_attempt(6),
+        reraise=True
+    )
+    async def _embed_batch(
+        self,
+        client: AsyncOpenAI,
+        batch: List[str],
+        semaphore: asyncio.Semaphore
+    ) -> List[List[float]]:
+        """Embed one batch, waiting for a free request slot and token budget."""
+        # ~4 characters per token is close enough; the headers correct drift
+        await self.token_bucket.acquire(sum(len(text) for text in batch) // 4 + len(batch))
+
+        async with semaphore:
+            raw = await client.embeddings.with_raw_response.create(
+                input=batch,
+                model=self.model,
+                **self.request_options
+            )
+
+        self.token_bucket.observe(raw.headers)
+        response = raw.parse()
+
+        # Extract embeddings in order
+        return [item.embedding for item in response.data]
+
+    @functools.cache
     def get_embedding_dimension(self) -> int:
         """
-        Get the dimension of the embedding model.
+        Get the dimension of the generated embeddings.
 
         Returns:
             Embedding dimension
         """
-        # Different models have different dimensions
-        dimensions = {
-            "text-embedding-3-large": 3072,
-            "text-embedding-3-small": 1536,
-            "text-embedding-ada-002": 1536,
-        }
-        return dimensions.get(self.model, 1536)
+        return EMBEDDING_DIMENSION
+
+
+@functools.cache
+def get_embedding_service() -> EmbeddingService:
+    """Shared embedding service, created on first use."""
+    return EmbeddingService()
 
 
-# Global embedding service instance
-embedding_service = EmbeddingService()
+def __getattr__(name: str):
+    """Resolve the embedding_service global lazily (PEP 562)."""
+    if name == "embedding_service":
+        return get_embedding_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
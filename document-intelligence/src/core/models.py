@@ -6,8 +6,9 @@ from datetime import datetime
 from enum import Enum as PyEnum
 from sqlalchemy import (
     Column, Integer, String, DateTime, ForeignKey,
-    Text, JSON, Float, Boolean, Enum, Index
+    Text, Float, Boolean, Enum, Index
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from src.core.database import Base
 
@@ -41,6 +42,23 @@ class UserRole(PyEnum):
     VIEWER = "viewer"
 
 
+def _string_enum(enum_class, name: str) -> Enum:
+    """
+    Enum column type stored as VARCHAR plus a CHECK constraint.
+
+    Values (not member names) are stored, so the column indexes and sorts
+    as a plain string and new members need no ALTER TYPE.
+    """
+    return Enum(
+        enum_class,
+        name=name,
+        native_enum=False,
+        create_constraint=True,
+        length=16,
+        values_callable=lambda members: [member.value for member in members]
+    )
+
+
 class User(Base):
     """User model for authentication and RBAC."""
     __tablename__ = "users"
@@ -50,15 +68,16 @@ class User(Base):
     email = Column(String(255), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
     full_name = Column(String(255))
-    role = Column(Enum(UserRole), default=UserRole.USER, nullable=False)
+    role = Column(_string_enum(UserRole, "ck_user_role"), default=UserRole.USER, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Relationships
-    documents = relationship("Document", back_populates="user")
-    search_history = relationship("SearchHistory", back_populates="user")
-    audit_logs = relationship("AuditLog", back_populates="user")
+    # Relationships. Collections never lazy-load: load them explicitly with
+    # selectinload() so a loop over users can't turn into one query per row.
+    documents = relationship("Document", back_populates="user", lazy="raise_on_sql")
+    search_history = relationship("SearchHistory", back_populates="user", lazy="raise_on_sql")
+    audit_logs = relationship("AuditLog", back_populates="user", lazy="raise_on_sql")
 
 
 class Document(Base):
@@ -70,8 +89,12 @@ class Document(Base):
     original_filename = Column(String(500), nullable=False)
     file_path = Column(String(1000), nullable=False)
     file_size = Column(Integer, nullable=False)  # Size in bytes
-    document_type = Column(Enum(DocumentType), nullable=False, index=True)
-    status = Column(Enum(ProcessingStatus), default=ProcessingStatus.PENDING, index=True)
+    document_type = Column(_string_enum(DocumentType, "ck_doc_type"), nullable=False, index=True)
+    status = Column(
+        _string_enum(ProcessingStatus, "ck_doc_status"),
+        default=ProcessingStatus.PENDING,
+        index=True
+    )
 
     # Metadata
     title = Column(String(500))
@@ -87,8 +110,9 @@ class Document(Base):
     processing_completed_at = Column(DateTime)
     processing_error = Column(Text)
 
-    # Additional metadata (JSON)
-    metadata = Column(JSON)
+    # Additional metadata (JSONB). The attribute can't be called
+    # `metadata`, which declarative classes reserve for the table registry.
+    extra_metadata = Column("metadata", JSONB)
 
     # Ownership
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -99,12 +123,27 @@ class Document(Base):
 
     # Relationships
     user = relationship("User", back_populates="documents")
-    chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan")
+    # Load with selectinload(); deleting a document needs its chunks loaded
+    chunks = relationship(
+        "DocumentChunk",
+        back_populates="document",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql"
+    )
 
     # Indexes
     __table_args__ = (
         Index("idx_doc_user_status", "user_id", "status"),
         Index("idx_doc_type_status", "document_type", "status"),
+        # Newest-first listing order, with id as tie-breaker
+        Index("idx_doc_uploaded_desc", uploaded_at.desc(), id.desc()),
+        # Listing filtered by status or type, already in listing order
+        Index("idx_doc_status_uploaded", "status", uploaded_at.desc(), id.desc()),
+        Index("idx_doc_type_uploaded", "document_type", uploaded_at.desc(), id.desc()),
+        # Covers the content-intelligence language/word-count aggregate
+        Index("idx_doc_language_words", "language", postgresql_include=["word_count"]),
+        # Containment (@>) filters on document metadata
+        Index("idx_doc_metadata_gin", "metadata", postgresql_using="gin"),
     )
 
 
@@ -130,8 +169,9 @@ class DocumentChunk(Base):
     # Vector database reference
     vector_id = Column(String(100), unique=True, index=True)  # Pinecone ID
 
-    # Additional metadata (JSON)
-    metadata = Column(JSON)
+    # Additional metadata (JSONB). The attribute can't be called
+    # `metadata`, which declarative classes reserve for the table registry.
+    extra_metadata = Column("metadata", JSONB)
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -159,7 +199,7 @@ class SearchHistory(Base):
     query_type = Column(String(50))  # hybrid, vector, keyword, rag
 
     # Search parameters
-    search_params = Column(JSON)
+    search_params = Column(JSONB)
 
     # Results
     results_count = Column(Integer)
@@ -177,6 +217,8 @@ class SearchHistory(Base):
     # Indexes
     __table_args__ = (
         Index("idx_search_user_date", "user_id", "created_at"),
+        # Time-window analytics grouped by strategy
+        Index("idx_search_date_type", "created_at", "query_type"),
     )
 
 
@@ -193,7 +235,7 @@ class AuditLog(Base):
     resource_id = Column(Integer)
 
     # Additional details
-    details = Column(JSON)
+    details = Column(JSONB)
     ip_address = Column(String(45))  # Support IPv6
     user_agent = Column(String(500))
 
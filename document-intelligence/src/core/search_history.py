@@ -0,0 +1,108 @@
+"""
+Buffered search history writer.
+Keeps history inserts off the search request path by batching them
+from a background task.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from config.settings import settings
+from src.core.database import AsyncSessionLocal
+from src.core.models import SearchHistory
+from src.utils.logger import app_logger as logger
+
+# Queued by stop() to tell the flusher to finish up
+_STOP = object()
+
+
+class SearchHistoryWriter:
+    """Queue search history rows and insert them in batches."""
+
+    def __init__(self):
+        """Initialize without a flusher; call start() on startup."""
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.search_history_queue_size)
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background flusher."""
+        self.task = asyncio.create_task(self._run())
+        logger.info("Search history writer started")
+
+    async def stop(self):
+        """Stop the flusher once everything queued so far is written."""
+        if self.task is not None:
+            # Rows recorded from here on are dropped rather than left queued
+            task, self.task = self.task, None
+            await self.queue.put(_STOP)
+            await task
+
+    def record(self, **row: Any):
+        """
+        Queue a search history row.
+
+        The row is dropped, with a warning, if no flusher is running or
+        the queue is full, so history never piles up unwritten.
+
+        Args:
+            row: SearchHistory column values
+        """
+        if self.task is None:
+            logger.warning("Search history writer is not running; dropping row")
+            return
+
+        # Stamp now, not at flush time, so analytics windows stay accurate
+        row.setdefault("created_at", datetime.utcnow())
+
+        try:
+            self.queue.put_nowait(row)
+        except asyncio.QueueFull:
+            logger.warning("Search history queue is full; dropping row")
+
+    async def _run(self):
+        """Flush a batch when it fills up or the flush interval elapses."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            item = await self.queue.get()
+            deadline = loop.time() + settings.search_history_flush_interval
+
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= settings.search_history_batch_size:
+                    break
+
+                try:
+                    item = self.queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self.queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+
+            if batch:
+                await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        """Insert a batch of rows in one executemany round-trip."""
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(SearchHistory), batch)
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to write {len(batch)} search history rows: {str(e)}")
+
+
+# Global search history writer instance
+search_history_writer = SearchHistoryWriter()
@@ -3,7 +3,10 @@ Pinecone vector store management.
 Handles initialization, upserting, and querying of vector embeddings.
 """
 
-from typing import List, Dict, Any, Optional
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Union
+import numpy as np
 from pinecone import Pinecone, ServerlessSpec
 from config.settings import settings
 from src.utils.logger import app_logger as logger
@@ -41,7 +44,11 @@ class VectorStore:
                 logger.info(f"Index {settings.pinecone_index_name} already exists")
 
             # Connect to index
-            self.index = self.pc.Index(settings.pinecone_index_name)
+            # pool_threads bounds how many async_req upserts run at once
+            self.index = self.pc.Index(
+                settings.pinecone_index_name,
+                pool_threads=settings.pinecone_upsert_concurrency
+            )
             logger.info("Pinecone initialization completed")
 
         except Exception as e:
@@ -50,24 +57,49 @@ class VectorStore:
 
     def upsert_vectors(
         self,
-        vectors: List[tuple],
-        namespace: str = ""
+        ids: List[str],
+        vectors: np.ndarray,
+        metadatas: List[Dict[str, Any]],
+        namespace: str = "",
+        batch_size: int = 100
     ) -> Dict[str, Any]:
         """
         Upsert vectors to Pinecone.
 
+        Vectors are sent in batches that stay under Pinecone's request size
+        limit, with up to settings.pinecone_upsert_concurrency batches in
+        flight at once.
+
         Args:
-            vectors: List of tuples (id, embedding, metadata)
+            ids: Vector IDs
+            vectors: (len(ids), dimension) array of embeddings
+            metadatas: Metadata for each vector
             namespace: Optional namespace for multi-tenancy
+            batch_size: Vectors per upsert request
 
         Returns:
-            Upsert response
+            Upsert summary with the total upserted_count
         """
+        vectors = np.asarray(vectors, dtype=np.float32)
+
         try:
-            logger.info(f"Upserting {len(vectors)} vectors to namespace: {namespace or 'default'}")
-            response = self.index.upsert(vectors=vectors, namespace=namespace)
-            logger.info(f"Successfully upserted {response.upserted_count} vectors")
-            return response
+            logger.info(f"Upserting {len(ids)} vectors to namespace: {namespace or 'default'}")
+            pending = [
+                self.index.upsert(
+                    # One tolist() per batch converts the whole slice in C
+                    vectors=list(zip(
+                        ids[i:i + batch_size],
+                        vectors[i:i + batch_size].tolist(),
+                        metadatas[i:i + batch_size]
+                    )),
+                    namespace=namespace,
+                    async_req=True
+                )
+                for i in range(0, len(ids), batch_size)
+            ]
+            upserted_count = sum(result.get().upserted_count for result in pending)
+            logger.info(f"Successfully upserted {upserted_count} vectors")
+            return {"upserted_count": upserted_count}
         except Exception as e:
             logger.error(f"Failed to upsert vectors: {str(e)}")
             raise
@@ -111,6 +143,61 @@ class VectorStore:
             logger.error(f"Failed to query vectors: {str(e)}")
             raise
 
+    def query_many(
+        self,
+        vectors: List[List[float]],
+        top_k: Union[int, List[int]] = 10,
+        filter: Optional[Dict[str, Any]] = None,
+        namespace: str = ""
+    ) -> Tuple[np.ndarray, np.ndarray, List[List[Dict[str, Any]]]]:
+        """
+        Run several queries concurrently and collect them column-wise.
+
+        Args:
+            vectors: Query embeddings
+            top_k: Number of results per query, or one count per query
+            filter: Metadata filter applied to every query
+            namespace: Optional namespace
+
+        Returns:
+            (ids, scores, metadatas): ids and scores are (len(vectors),
+            max top_k) arrays, padded with None / NaN where a query returned
+            fewer matches; metadatas holds each query's match metadata in order
+        """
+        top_ks = [top_k] * len(vectors) if isinstance(top_k, int) else list(top_k)
+        width = max(top_ks, default=0)
+
+        logger.debug(f"Querying Pinecone with {len(vectors)} vectors, top_k={top_k}")
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(vectors) or 1) as executor:
+                responses = list(executor.map(
+                    lambda vector, k: self.index.query(
+                        vector=vector,
+                        top_k=k,
+                        filter=filter,
+                        namespace=namespace,
+                        include_metadata=True
+                    ),
+                    vectors,
+                    top_ks
+                ))
+        except Exception as e:
+            logger.error(f"Failed to query vectors: {str(e)}")
+            raise
+
+        ids = np.full((len(vectors), width), None, dtype=object)
+        scores = np.full((len(vectors), width), np.nan, dtype=np.float32)
+        metadatas = []
+
+        for row, response in enumerate(responses):
+            matches = response.matches
+            ids[row, :len(matches)] = [match.id for match in matches]
+            scores[row, :len(matches)] = [match.score for match in matches]
+            metadatas.append([match.metadata for match in matches])
+
+        return ids, scores, metadatas
+
     def delete_by_ids(
         self,
         ids: List[str],
@@ -185,5 +272,14 @@ class VectorStore:
             raise
 
 
-# Global vector store instance
-vector_store = VectorStore()
+@functools.cache
+def get_vector_store() -> VectorStore:
+    """Shared vector store, connected to Pinecone on first use."""
+    return VectorStore()
+
+
+def __getattr__(name: str):
+    """Resolve the vector_store global lazily (PEP 562)."""
+    if name == "vector_store":
+        return get_vector_store()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
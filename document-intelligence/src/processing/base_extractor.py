@@ -4,15 +4,60 @@ All document extractors should inherit from this class.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 from dataclasses import dataclass
 from datetime import datetime
 
+import numpy as np
+from langdetect import DetectorFactory, LangDetectException, detect
 
-@dataclass
+# langdetect is randomized; pin it so a document always gets the same answer
+DetectorFactory.seed = 0
+
+# Characters inspected for language detection
+LANGUAGE_SAMPLE_CHARS = 100_000
+
+# Characters per NumPy pass when counting words, bounding scratch memory
+WORD_COUNT_CHUNK_CHARS = 1_000_000
+
+# Every code point str.isspace() accepts, i.e. what str.split() splits on
+_WHITESPACE = np.array(
+    [0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x1C, 0x1D, 0x1E, 0x1F, 0x20, 0x85, 0xA0, 0x1680,
+     *range(0x2000, 0x200B), 0x2028, 0x2029, 0x202F, 0x205F, 0x3000],
+    dtype=np.uint32
+)
+
+# Letter ranges per script, sorted and non-overlapping. Scripts used by a
+# single major language map straight to it; scripts shared by several
+# languages are named in _SHARED_SCRIPTS and need langdetect.
+_SCRIPT_RANGES = [
+    (0x0041, 0x005A, "latin"),
+    (0x0061, 0x007A, "latin"),
+    (0x00C0, 0x024F, "latin"),
+    (0x0370, 0x03FF, "el"),
+    (0x0400, 0x04FF, "cyrillic"),
+    (0x0590, 0x05FF, "he"),
+    (0x0600, 0x06FF, "arabic"),
+    (0x0900, 0x097F, "devanagari"),
+    (0x0E00, 0x0E7F, "th"),
+    (0x3040, 0x30FF, "ja"),  # Hiragana and Katakana
+    (0x4E00, 0x9FFF, "zh"),  # CJK ideographs, also used in Japanese
+    (0xAC00, 0xD7AF, "ko"),
+]
+_SCRIPT_STARTS = np.array([start for start, _, _ in _SCRIPT_RANGES], dtype=np.uint32)
+_SCRIPT_ENDS = np.array([end for _, end, _ in _SCRIPT_RANGES], dtype=np.uint32)
+_SCRIPT_LABELS = [label for _, _, label in _SCRIPT_RANGES]
+_SHARED_SCRIPTS = frozenset({"latin", "cyrillic", "arabic", "devanagari"})
+
+
+@dataclass(slots=True, frozen=True)
 class ExtractedDocument:
-    """Container for extracted document content and metadata."""
+    """
+    Container for extracted document content and metadata.
+
+    Immutable once built; use dataclasses.replace() to derive a copy.
+    """
     content: str
     metadata: Dict[str, Any]
     page_count: Optional[int] = None
@@ -27,6 +72,9 @@ class ExtractedDocument:
 class BaseExtractor(ABC):
     """Abstract base class for document extractors."""
 
+    # Lowercase extensions, without the dot, this extractor handles
+    SUPPORTED_EXTENSIONS: List[str] = []
+
     @abstractmethod
     def extract(self, file_path: Path) -> ExtractedDocument:
         """
@@ -58,14 +106,64 @@ class BaseExtractor(ABC):
         return file_path.suffix.lower().lstrip('.')
 
     def _count_words(self, text: str) -> int:
-        """Count words in text."""
-        return len(text.split())
+        """
+        Count words in text, matching len(text.split()).
+
+        Counts whitespace-to-text transitions over the code points instead
+        of materializing every word as a string.
+        """
+        count = 0
+        prev_space = True
+
+        for start in range(0, len(text), WORD_COUNT_CHUNK_CHARS):
+            chunk = text[start:start + WORD_COUNT_CHUNK_CHARS]
+            codepoints = np.frombuffer(chunk.encode('utf-32-le'), dtype='<u4')
+            space = np.isin(codepoints, _WHITESPACE)
+
+            word_start = ~space
+            word_start[1:] &= space[:-1]
+            word_start[0] &= prev_space
+
+            count += int(np.count_nonzero(word_start))
+            prev_space = bool(space[-1])
+
+        return count
 
     def _detect_language(self, text: str) -> Optional[str]:
         """
         Detect language of text.
-        Simple implementation - can be enhanced with langdetect library.
+
+        Buckets the sample's code points by script in one NumPy pass; only
+        text in a script shared by several languages (Latin, Cyrillic,
+        Arabic, Devanagari) goes to langdetect.
+
+        Returns:
+            ISO 639-1 code, or None if the text has no letters
         """
-        # Basic implementation - returns English as default
-        # Can be enhanced with proper language detection
-        return "en"
+        sample = text[:LANGUAGE_SAMPLE_CHARS]
+        codepoints = np.frombuffer(sample.encode('utf-32-le'), dtype='<u4')
+
+        slot = np.searchsorted(_SCRIPT_STARTS, codepoints, side='right') - 1
+        in_range = (slot >= 0) & (codepoints <= _SCRIPT_ENDS[np.maximum(slot, 0)])
+        counts = np.bincount(slot[in_range], minlength=len(_SCRIPT_RANGES))
+
+        totals: Dict[str, int] = {}
+        for label, count in zip(_SCRIPT_LABELS, counts.tolist()):
+            totals[label] = totals.get(label, 0) + count
+
+        script = max(totals, key=totals.get)
+        if totals[script] == 0:
+            return None
+
+        # Japanese mixes kana with CJK ideographs; any real share of kana
+        # means Japanese rather than Chinese
+        if script == "zh" and totals["ja"] * 5 >= totals["zh"]:
+            return "ja"
+
+        if script not in _SHARED_SCRIPTS:
+            return script
+
+        try:
+            return detect(sample)
+        except LangDetectException:
+            return "en"
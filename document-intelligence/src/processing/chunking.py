@@ -3,17 +3,124 @@ Smart chunking strategies for document processing.
 Implements semantic chunking, recursive splitting, and parent-child relationships.
 """
 
-from typing import List, Dict, Any, Optional
+import re
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from dataclasses import dataclass
-from langchain.text_splitter import (
-    RecursiveCharacterTextSplitter,
-    TokenTextSplitter
-)
+from langchain.text_splitter import RecursiveCharacterTextSplitter
 from config.settings import settings
 from src.utils.logger import app_logger as logger
 
+if TYPE_CHECKING:
+    import tiktoken
+
+# Leeway, in characters, around where a chunk is expected to start: the
+# splitter strips whitespace and counts separators toward the overlap
+_OFFSET_SLACK = 32
+
+# Page separators and markdown headings
+_SECTION_PREFIXES = ('===', '# ', '## ', '### ')
+
+# Lines that might be section markers: starting with '=' or '#', free of
+# lowercase ASCII (could be all caps), or ending in ':'. A superset of
+# _is_section_marker, so prose lines are rejected by the regex engine.
+_SECTION_CANDIDATE_RE = re.compile(r'^(?:[^\S\n]*[=#].*|[^a-z\n]*|.*:[^\S\n]*)$', re.MULTILINE)
+
+# chunk_by_tokens encoding (TokenTextSplitter's default) and overlap in tokens
+_TOKEN_ENCODING = "gpt2"
+_TOKEN_OVERLAP = 50
+
+# Structure-aware separators for chunk_recursive, coarsest first
+_STRUCTURE_SEPARATORS = (
+    "\n\n\n",  # Major sections
+    "\n\n",    # Paragraphs
+    "\n",      # Lines
+    ". ",      # Sentences
+    ", ",      # Clauses
+    " ",       # Words
+    ""         # Characters
+)
+
 
-@dataclass
+@lru_cache(maxsize=16)
+def _recursive_splitter(
+    chunk_size: int,
+    chunk_overlap: int,
+    separators: Optional[Tuple[str, ...]] = None
+) -> RecursiveCharacterTextSplitter:
+    """Shared character splitter for a configuration; splitters are stateless."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        separators=list(separators) if separators is not None else None
+    )
+
+
+@lru_cache(maxsize=4)
+def _token_encoding(encoding_name: str) -> "tiktoken.Encoding":
+    """Shared tiktoken encoding, so its BPE ranks are loaded once."""
+    import tiktoken
+
+    return tiktoken.get_encoding(encoding_name)
+
+
+def _token_windows(
+    encoding: "tiktoken.Encoding",
+    text: str,
+    tokens_per_chunk: int,
+    overlap: int
+) -> List[Tuple[int, int]]:
+    """
+    Character span of each overlapping window of tokens_per_chunk tokens.
+
+    The text is encoded once, and only the runs of tokens between window
+    boundaries are decoded, each token once, to find where the boundaries
+    fall. Windows are slices of the source text, so a boundary that splits
+    a multibyte character backs up to that character's start.
+
+    Args:
+        encoding: Encoding to count tokens with
+        text: Text to split
+        tokens_per_chunk: Tokens per window
+        overlap: Tokens shared by consecutive windows
+
+    Returns:
+        (start_char, end_char) of each window, in order
+    """
+    ids = encoding.encode(text)
+    step = tokens_per_chunk - overlap
+
+    token_windows = []
+    for start in range(0, len(ids), step):
+        end = min(start + tokens_per_chunk, len(ids))
+        token_windows.append((start, end))
+        if end == len(ids):
+            break
+
+    text_bytes = text.encode("utf-8")
+    char_at = {}
+    token_pos = byte_pos = char_byte = char_pos = 0
+
+    for boundary in sorted({b for window in token_windows for b in window}):
+        byte_pos += len(encoding.decode_bytes(ids[token_pos:boundary]))
+        token_pos = boundary
+
+        # Back up over UTF-8 continuation bytes to a character start
+        boundary_byte = byte_pos
+        while boundary_byte < len(text_bytes) and text_bytes[boundary_byte] & 0xC0 == 0x80:
+            boundary_byte -= 1
+
+        char_pos += len(text_bytes[char_byte:boundary_byte].decode("utf-8"))
+        char_byte = boundary_byte
+        char_at[boundary] = char_pos
+
+    return [(char_at[start], char_at[end]) for start, end in token_windows]
+
+
+@dataclass(slots=True)
 class Chunk:
     """Container for a text chunk."""
     content: str
@@ -24,6 +131,45 @@ class Chunk:
     parent_chunk_id: Optional[int] = None
 
 
+def _chunk_offsets(text: str, pieces: List[str], overlap: Optional[int]) -> List[int]:
+    """
+    Start offset in text of each piece a splitter produced, in order.
+
+    Each piece is searched for only in a small window next to the previous
+    one, so locating every piece is linear in len(text). A piece missing
+    from its window falls back to a search of the rest of the text.
+
+    Args:
+        text: Text that was split
+        pieces: Splitter output, in order
+        overlap: Character overlap between consecutive pieces, or None
+            when it isn't measured in characters
+
+    Returns:
+        Start offset for each piece
+    """
+    offsets = []
+    prev_start, prev_end = -1, 0
+
+    for piece in pieces:
+        if overlap is None:
+            lo = prev_start + 1
+        else:
+            lo = max(prev_start + 1, prev_end - overlap - _OFFSET_SLACK)
+        hi = max(lo, prev_end) + len(piece) + _OFFSET_SLACK
+
+        start = text.find(piece, lo, hi)
+        if start == -1:
+            start = text.find(piece, lo)
+        if start == -1:
+            start = prev_end
+
+        offsets.append(start)
+        prev_start, prev_end = start, start + len(piece)
+
+    return offsets
+
+
 class ChunkingStrategy:
     """Smart chunking strategies for document processing."""
 
@@ -62,51 +208,166 @@ class ChunkingStrategy:
         """
         logger.info(f"Chunking text with recursive strategy (size={self.chunk_size}, overlap={self.chunk_overlap})")
 
-        # Create splitter with structure-aware separators
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            separators=[
-                "\n\n\n",  # Major sections
-                "\n\n",    # Paragraphs
-                "\n",      # Lines
-                ". ",      # Sentences
-                ", ",      # Clauses
-                " ",       # Words
-                ""         # Characters
-            ]
-        )
+        # Splitter with structure-aware separators
+        splitter = _recursive_splitter(self.chunk_size, self.chunk_overlap, _STRUCTURE_SEPARATORS)
+        chunks = self._split_recursive(splitter, text, metadata)
 
-        # Split text
-        text_chunks = splitter.split_text(text)
+        logger.info(f"Created {len(chunks)} chunks")
+        return chunks
 
-        # Create Chunk objects
-        chunks = []
-        current_pos = 0
+    def chunk_many(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> List[List[Chunk]]:
+        """
+        Recursively chunk several texts in this process.
 
-        for i, chunk_text in enumerate(text_chunks):
-            # Find chunk position in original text
-            start_pos = text.find(chunk_text, current_pos)
-            if start_pos == -1:
-                start_pos = current_pos
+        Same output as chunk_recursive per text, with the splitter looked
+        up and progress logged once for the whole batch.
 
-            end_pos = start_pos + len(chunk_text)
+        Args:
+            texts: Texts to chunk
+            metadatas: Optional metadata for each text's chunks
 
-            # Create chunk
-            chunk = Chunk(
+        Returns:
+            Chunks for each text, in input order
+        """
+        logger.info(f"Chunking {len(texts)} texts with recursive strategy (size={self.chunk_size}, overlap={self.chunk_overlap})")
+
+        splitter = _recursive_splitter(self.chunk_size, self.chunk_overlap, _STRUCTURE_SEPARATORS)
+        metadatas = metadatas or [None] * len(texts)
+        results = [
+            self._split_recursive(splitter, text, metadata)
+            for text, metadata in zip(texts, metadatas)
+        ]
+
+        logger.info(f"Created {sum(map(len, results))} chunks")
+        return results
+
+    def chunk_stream(
+        self,
+        pages: Iterable[Tuple[int, str]],
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Chunk]:
+        """
+        Recursively chunk a document that arrives page by page.
+
+        Takes the (page_num, text) pairs an extractor's iter_pages yields.
+        The pages are treated as one text joined with blank lines, like the
+        extractor's content. A chunk is yielded once the next page can no
+        longer change it, so only the current page and the unfinished last
+        chunk are held in memory.
+
+        Args:
+            pages: (page_num, text) pairs, in order
+            metadata: Optional metadata
+
+        Yields:
+            Chunks, with offsets into the joined text and the page each
+            starts on as metadata["page_number"]
+        """
+        logger.info(f"Streaming text through recursive strategy (size={self.chunk_size}, overlap={self.chunk_overlap})")
+
+        splitter = _recursive_splitter(self.chunk_size, self.chunk_overlap, _STRUCTURE_SEPARATORS)
+        buffer = None
+        buffer_start = 0
+        index = 0
+
+        # Start offset and number of each page still in the buffer
+        page_starts: List[int] = []
+        page_nums: List[int] = []
+
+        def place(chunk: Chunk) -> Chunk:
+            """Number a buffer chunk and move it into joined-text coordinates."""
+            nonlocal index
+            chunk.index = index
+            chunk.start_char += buffer_start
+            chunk.end_char += buffer_start
+            page_num = page_nums[bisect_right(page_starts, chunk.start_char) - 1]
+            chunk.metadata = {**(metadata or {}), "page_number": page_num}
+            index += 1
+            return chunk
+
+        for page_num, page in pages:
+            if buffer is None:
+                buffer = page
+                page_starts.append(buffer_start)
+            else:
+                page_starts.append(buffer_start + len(buffer) + 2)
+                buffer = f"{buffer}\n\n{page}"
+            page_nums.append(page_num)
+
+            if len(buffer) <= self.chunk_size:
+                continue
+
+            # Everything but the last chunk is final; carry that one over
+            # so it can run on into the next page
+            chunks = self._split_recursive(splitter, buffer, metadata)
+            if len(chunks) < 2:
+                continue
+
+            for chunk in chunks[:-1]:
+                yield place(chunk)
+
+            carry = chunks[-1].start_char
+            buffer = buffer[carry:]
+            buffer_start += carry
+
+            # Forget pages that end before the carried text
+            first_kept = bisect_right(page_starts, buffer_start) - 1
+            del page_starts[:first_kept], page_nums[:first_kept]
+
+        for chunk in self._split_recursive(splitter, buffer or "", metadata):
+            yield place(chunk)
+
+        logger.info(f"Created {index} chunks")
+
+    def _split_recursive(
+        self,
+        splitter: RecursiveCharacterTextSplitter,
+        text: str,
+        metadata: Optional[Dict[str, Any]]
+    ) -> List[Chunk]:
+        """Split one text and wrap the pieces as Chunks with source offsets."""
+        text_chunks = splitter.split_text(text)
+        offsets = _chunk_offsets(text, text_chunks, self.chunk_overlap)
+
+        return [
+            Chunk(
                 content=chunk_text,
                 index=i,
                 start_char=start_pos,
-                end_char=end_pos,
+                end_char=start_pos + len(chunk_text),
                 metadata=metadata or {}
             )
+            for i, (chunk_text, start_pos) in enumerate(zip(text_chunks, offsets))
+        ]
 
-            chunks.append(chunk)
-            current_pos = end_pos
+    def chunk_batch(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        max_workers: Optional[int] = None
+    ) -> List[List[Chunk]]:
+        """
+        Recursively chunk several texts in parallel worker processes.
 
-        logger.info(f"Created {len(chunks)} chunks")
-        return chunks
+        Args:
+            texts: Texts to chunk
+            metadatas: Optional metadata for each text's chunks
+            max_workers: Worker processes (default: one per CPU)
+
+        Returns:
+            Chunks for each text, in input order
+        """
+        metadatas = metadatas or [None] * len(texts)
+
+        if len(texts) <= 1:
+            return self.chunk_many(texts, metadatas)
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.chunk_recursive, texts, metadatas))
 
     def chunk_with_parent_child(
         self,
@@ -135,21 +396,18 @@ class ChunkingStrategy:
         logger.info(f"Creating parent-child chunks (parent={parent_size}, child={child_size})")
 
         # Create parent chunks (larger)
-        parent_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=parent_size,
-            chunk_overlap=self.chunk_overlap * 2,
-            length_function=len,
-        )
+        parent_splitter = _recursive_splitter(parent_size, self.chunk_overlap * 2)
 
         parent_texts = parent_splitter.split_text(text)
+        parent_offsets = _chunk_offsets(text, parent_texts, self.chunk_overlap * 2)
         parent_chunks = []
 
-        for i, parent_text in enumerate(parent_texts):
+        for i, (parent_text, start_pos) in enumerate(zip(parent_texts, parent_offsets)):
             parent_chunk = Chunk(
                 content=parent_text,
                 index=i,
-                start_char=text.find(parent_text),
-                end_char=text.find(parent_text) + len(parent_text),
+                start_char=start_pos,
+                end_char=start_pos + len(parent_text),
                 metadata={
                     **(metadata or {}),
                     "chunk_type": "parent",
@@ -158,24 +416,23 @@ class ChunkingStrategy:
             parent_chunks.append(parent_chunk)
 
         # Create child chunks (smaller) for each parent
-        child_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=child_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-        )
+        child_splitter = _recursive_splitter(child_size, self.chunk_overlap)
 
         all_child_chunks = []
         child_index = 0
 
         for parent_idx, parent_chunk in enumerate(parent_chunks):
             child_texts = child_splitter.split_text(parent_chunk.content)
+            # Children are located within their parent, then shifted
+            child_offsets = _chunk_offsets(parent_chunk.content, child_texts, self.chunk_overlap)
 
-            for child_text in child_texts:
+            for child_text, offset in zip(child_texts, child_offsets):
+                start_pos = parent_chunk.start_char + offset
                 child_chunk = Chunk(
                     content=child_text,
                     index=child_index,
-                    start_char=text.find(child_text, parent_chunk.start_char),
-                    end_char=text.find(child_text, parent_chunk.start_char) + len(child_text),
+                    start_char=start_pos,
+                    end_char=start_pos + len(child_text),
                     metadata={
                         **(metadata or {}),
                         "chunk_type": "child",
@@ -208,25 +465,18 @@ class ChunkingStrategy:
         """
         logger.info(f"Chunking text by tokens (tokens_per_chunk={tokens_per_chunk})")
 
-        splitter = TokenTextSplitter(
-            chunk_size=tokens_per_chunk,
-            chunk_overlap=50
-        )
+        if tokens_per_chunk <= _TOKEN_OVERLAP:
+            raise ValueError(f"tokens_per_chunk must be greater than {_TOKEN_OVERLAP}")
 
-        text_chunks = splitter.split_text(text)
+        windows = _token_windows(
+            _token_encoding(_TOKEN_ENCODING), text, tokens_per_chunk, _TOKEN_OVERLAP
+        )
 
         chunks = []
-        current_pos = 0
-
-        for i, chunk_text in enumerate(text_chunks):
-            start_pos = text.find(chunk_text, current_pos)
-            if start_pos == -1:
-                start_pos = current_pos
-
-            end_pos = start_pos + len(chunk_text)
 
+        for i, (start_pos, end_pos) in enumerate(windows):
             chunk = Chunk(
-                content=chunk_text,
+                content=text[start_pos:end_pos],
                 index=i,
                 start_char=start_pos,
                 end_char=end_pos,
@@ -237,7 +487,6 @@ class ChunkingStrategy:
             )
 
             chunks.append(chunk)
-            current_pos = end_pos
 
         logger.info(f"Created {len(chunks)} token-based chunks")
         return chunks
@@ -261,41 +510,37 @@ class ChunkingStrategy:
         """
         logger.info("Chunking text by sections")
 
-        # Split by common section markers
-        sections = []
-        current_section = []
-        current_pos = 0
+        # Split by common section markers, as (start, end) offsets. Only
+        # candidate lines reach the exact check; a marker starts a new
+        # section, except on the first line.
+        boundaries = [
+            match.start() for match in _SECTION_CANDIDATE_RE.finditer(text)
+            if match.start() and self._is_section_marker(match.group())
+        ]
 
-        for line in text.split('\n'):
-            # Check if line is a section marker
-            if self._is_section_marker(line):
-                # Save previous section
-                if current_section:
-                    sections.append('\n'.join(current_section))
-                    current_section = []
+        sections = []
+        section_start = 0
 
-            current_section.append(line)
+        for line_start in boundaries:
+            sections.append((section_start, line_start - 1))  # Drop the joining newline
+            section_start = line_start
 
-        # Add final section
-        if current_section:
-            sections.append('\n'.join(current_section))
+        sections.append((section_start, len(text)))
 
         # Create chunks from sections
         chunks = []
-        current_pos = 0
 
-        for i, section_text in enumerate(sections):
+        for i, (start_pos, end_pos) in enumerate(sections):
+            section_text = text[start_pos:end_pos]
+
             # If section is too large, split it further
             if len(section_text) > self.chunk_size * 2:
                 section_chunks = self.chunk_recursive(section_text, metadata)
+                for section_chunk in section_chunks:
+                    section_chunk.start_char += start_pos
+                    section_chunk.end_char += start_pos
                 chunks.extend(section_chunks)
             else:
-                start_pos = text.find(section_text, current_pos)
-                if start_pos == -1:
-                    start_pos = current_pos
-
-                end_pos = start_pos + len(section_text)
-
                 chunk = Chunk(
                     content=section_text,
                     index=i,
@@ -308,7 +553,6 @@ class ChunkingStrategy:
                 )
 
                 chunks.append(chunk)
-                current_pos = end_pos
 
         logger.info(f"Created {len(chunks)} section-based chunks")
         return chunks
@@ -317,17 +561,10 @@ class ChunkingStrategy:
         """Check if line is a section marker (heading, page break, etc.)."""
         line = line.strip()
 
-        # Check for various section markers
-        markers = [
-            line.startswith('==='),  # Page separator
-            line.startswith('# '),   # Markdown heading
-            line.startswith('## '),
-            line.startswith('### '),
-            line.isupper() and len(line) < 100,  # All caps heading
-            line.endswith(':') and len(line) < 100,  # Heading with colon
-        ]
-
-        return any(markers)
+        # Short-circuits: most lines are prose and fail both tests cheaply
+        return line.startswith(_SECTION_PREFIXES) or (
+            len(line) < 100 and (line.isupper() or line.endswith(':'))  # All caps or colon heading
+        )
 
 
 # Global chunking strategy instance
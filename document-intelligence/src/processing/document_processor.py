@@ -3,9 +3,11 @@ Document processor factory.
 Orchestrates document extraction using appropriate extractors.
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, Iterator, Optional, List, Union
 from src.processing.base_extractor import BaseExtractor, ExtractedDocument
+from src.processing.chunking import Chunk, ChunkingStrategy, chunking_strategy
 from src.processing.pdf_extractor import PDFExtractor
 from src.processing.docx_extractor import DOCXExtractor
 from src.processing.xlsx_extractor import XLSXExtractor
@@ -30,6 +32,12 @@ class DocumentProcessor:
             TextExtractor(),
         ]
 
+        # Extension -> extractor; the first extractor to claim one wins
+        self._ext_map: Dict[str, BaseExtractor] = {}
+        for extractor in self.extractors:
+            for ext in extractor.SUPPORTED_EXTENSIONS:
+                self._ext_map.setdefault(ext, extractor)
+
     def process_document(self, file_path: Path) -> ExtractedDocument:
         """
         Process a document using the appropriate extractor.
@@ -43,6 +51,93 @@ class DocumentProcessor:
         Raises:
             ValueError: If no suitable extractor is found
         """
+        extractor = self._require_extractor(file_path)
+
+        logger.info(f"Processing {file_path} with {extractor.__class__.__name__}")
+
+        # Extract content
+        return extractor.extract(file_path)
+
+    def chunk_document(
+        self,
+        file_path: Path,
+        metadata: Optional[Dict[str, Any]] = None,
+        strategy: Optional[ChunkingStrategy] = None
+    ) -> Iterator[Chunk]:
+        """
+        Extract a document and chunk it recursively.
+
+        PDFs are streamed into the chunker page by page, so their full text
+        is never built. Other documents are extracted whole, as is a PDF
+        whose pages yield no text (e.g. one only PyPDF2 can read).
+
+        Args:
+            file_path: Path to the document file
+            metadata: Optional metadata for every chunk
+            strategy: Chunking strategy (default: the global one)
+
+        Yields:
+            Chunks, in document order
+
+        Raises:
+            ValueError: If no suitable extractor is found
+        """
+        extractor = self._require_extractor(file_path)
+        strategy = strategy or chunking_strategy
+
+        if isinstance(extractor, PDFExtractor):
+            logger.info(f"Streaming {file_path} pages into chunks")
+
+            streamed = False
+            try:
+                for chunk in strategy.chunk_stream(extractor.iter_pages(file_path), metadata):
+                    streamed = True
+                    yield chunk
+            except Exception as e:
+                if streamed:
+                    raise
+                logger.warning(f"Page streaming failed for {file_path}, extracting whole: {str(e)}")
+
+            if streamed:
+                return
+
+        content = self.process_document(file_path).content
+        yield from strategy.chunk_recursive(content, metadata)
+
+    def process_documents(
+        self,
+        file_paths: List[Path],
+        max_workers: Optional[int] = None
+    ) -> List[Union[ExtractedDocument, Exception]]:
+        """
+        Process several documents in parallel worker processes.
+
+        Extraction is CPU-bound, so separate processes sidestep the GIL.
+        A failing document doesn't stop the others.
+
+        Args:
+            file_paths: Paths to the document files
+            max_workers: Worker processes (default: one per CPU)
+
+        Returns:
+            ExtractedDocument, or the exception raised, for each path in order
+        """
+        if len(file_paths) <= 1:
+            return [_process_one(path) for path in file_paths]
+
+        logger.info(f"Processing {len(file_paths)} documents in parallel")
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_process_one, file_paths))
+
+    def _require_extractor(self, file_path: Path) -> BaseExtractor:
+        """
+        Find the extractor for an existing file.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            ValueError: If no suitable extractor is found
+        """
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
@@ -54,10 +149,7 @@ class DocumentProcessor:
                 f"No suitable extractor found for file type: {file_path.suffix}"
             )
 
-        logger.info(f"Processing {file_path} with {extractor.__class__.__name__}")
-
-        # Extract content
-        return extractor.extract(file_path)
+        return extractor
 
     def _get_extractor(self, file_path: Path) -> Optional[BaseExtractor]:
         """
@@ -69,11 +161,7 @@ class DocumentProcessor:
         Returns:
             Suitable extractor or None
         """
-        for extractor in self.extractors:
-            if extractor.can_handle(file_path):
-                return extractor
-
-        return None
+        return self._ext_map.get(file_path.suffix.lower().lstrip('.'))
 
     def can_process(self, file_path: Path) -> bool:
         """
@@ -94,25 +182,16 @@ class DocumentProcessor:
         Returns:
             List of supported extensions
         """
-        extensions = set()
+        return sorted(self._ext_map)
 
-        # Collect extensions from all extractors
-        for extractor in self.extractors:
-            if hasattr(extractor, 'SUPPORTED_EXTENSIONS'):
-                extensions.update(extractor.SUPPORTED_EXTENSIONS)
-            else:
-                # Try common extensions for each extractor type
-                ext_map = {
-                    'PDFExtractor': ['pdf'],
-                    'DOCXExtractor': ['docx'],
-                    'XLSXExtractor': ['xlsx', 'xls'],
-                    'PPTXExtractor': ['pptx'],
-                }
-                ext_name = extractor.__class__.__name__
-                if ext_name in ext_map:
-                    extensions.update(ext_map[ext_name])
-
-        return sorted(list(extensions))
+
+def _process_one(file_path: Path) -> Union[ExtractedDocument, Exception]:
+    """Process one document with this process's processor (pool worker)."""
+    try:
+        return document_processor.process_document(file_path)
+    except Exception as e:
+        logger.error(f"Failed to process {file_path}: {str(e)}")
+        return e
 
 
 # Global document processor instance
@@ -4,19 +4,34 @@ Handles Microsoft Word documents with structure preservation.
 """
 
 from pathlib import Path
-from typing import Dict, Any
-from docx import Document
+from typing import TYPE_CHECKING, Dict, Any, Optional
 from datetime import datetime
 from src.processing.base_extractor import BaseExtractor, ExtractedDocument
 from src.utils.logger import app_logger as logger
 
+# Parsing libraries are imported where used, so a worker only loads
+# the ones for the formats it actually sees
+if TYPE_CHECKING:
+    from docx.document import Document
+
+
+def _heading_prefix(style_name: str) -> Optional[str]:
+    """Markdown prefix for a 'Heading N' paragraph style, or None for body text."""
+    if not style_name.startswith('Heading'):
+        return None
+
+    level = style_name.replace('Heading ', '')
+    return f"{'#' * int(level) if level.isdigit() else '#'} "
+
 
 class DOCXExtractor(BaseExtractor):
     """Extractor for DOCX documents."""
 
+    SUPPORTED_EXTENSIONS = ['docx']
+
     def can_handle(self, file_path: Path) -> bool:
         """Check if file is a DOCX."""
-        return self._get_file_extension(file_path) == 'docx'
+        return self._get_file_extension(file_path) in self.SUPPORTED_EXTENSIONS
 
     def extract(self, file_path: Path) -> ExtractedDocument:
         """
@@ -30,6 +45,8 @@ class DOCXExtractor(BaseExtractor):
         """
         logger.info(f"Extracting DOCX: {file_path}")
 
+        from docx import Document
+
         try:
             doc = Document(file_path)
 
@@ -61,18 +78,31 @@ class DOCXExtractor(BaseExtractor):
             logger.error(f"Failed to extract DOCX {file_path}: {str(e)}")
             raise
 
-    def _extract_content(self, doc: Document) -> str:
+    def _extract_content(self, doc: "Document") -> str:
         """Extract content while preserving document structure."""
+        from docx.enum.style import WD_STYLE_TYPE
+        from docx.oxml.ns import qn
+
         content = []
 
-        # Extract paragraphs
-        for paragraph in doc.paragraphs:
-            text = paragraph.text.strip()
+        # Resolve each paragraph style's heading prefix once; Paragraph.style
+        # would search the styles part again for every paragraph
+        heading_prefixes = {
+            style.style_id: _heading_prefix(style.name or "")
+            for style in doc.styles
+            if style.type == WD_STYLE_TYPE.PARAGRAPH
+        }
+        default_style = doc.styles.default(WD_STYLE_TYPE.PARAGRAPH)
+        default_prefix = _heading_prefix(default_style.name or "") if default_style is not None else None
+
+        # Extract body paragraphs straight from the XML (tables come below)
+        for p in doc.element.body.iterchildren(qn('w:p')):
+            text = p.text.strip()
             if text:
                 # Identify headings by style
-                if paragraph.style.name.startswith('Heading'):
-                    level = paragraph.style.name.replace('Heading ', '')
-                    content.append(f"\n{'#' * int(level) if level.isdigit() else '#'} {text}\n")
+                prefix = heading_prefixes.get(p.style, default_prefix)
+                if prefix is not None:
+                    content.append(f"\n{prefix}{text}\n")
                 else:
                     content.append(text)
 
@@ -86,15 +116,23 @@ class DOCXExtractor(BaseExtractor):
 
     def _extract_table(self, table) -> str:
         """Extract table content."""
-        table_text = []
-
-        for row in table.rows:
-            row_text = "\t".join(cell.text.strip() for cell in row.cells)
-            table_text.append(row_text)
-
-        return "\n".join(table_text)
-
-    def _extract_metadata(self, doc: Document, file_path: Path) -> Dict[str, Any]:
+        # row.cells rebuilds the whole table's cell grid on every call, so
+        # build it once and slice rows out of it the same way
+        cells = table._cells
+        column_count = len(table.columns)
+
+        # Merged cells repeat the same object; read each one's text once
+        cell_text: Dict[int, str] = {}
+        for cell in cells:
+            if id(cell) not in cell_text:
+                cell_text[id(cell)] = cell.text.strip()
+
+        return "\n".join(
+            "\t".join([cell_text[id(cell)] for cell in cells[start:start + column_count]])
+            for start in range(0, len(table.rows) * column_count, column_count)
+        )
+
+    def _extract_metadata(self, doc: "Document", file_path: Path) -> Dict[str, Any]:
         """Extract DOCX metadata."""
         metadata = {}
 
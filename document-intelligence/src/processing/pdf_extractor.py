@@ -3,21 +3,29 @@ PDF document extractor.
 Handles both native and scanned PDFs using PyPDF2 and pdfplumber.
 """
 
+import re
 from pathlib import Path
-from typing import Dict, Any
-import PyPDF2
-import pdfplumber
+from typing import TYPE_CHECKING, Dict, Any, Iterator, Tuple
 from datetime import datetime
 from src.processing.base_extractor import BaseExtractor, ExtractedDocument
 from src.utils.logger import app_logger as logger
 
+if TYPE_CHECKING:
+    from pdfplumber.pdf import PDF
+
+# PDF date string (D:YYYYMMDDHHmmSS, then an optional timezone); the
+# timezone is ignored
+_PDF_DATE_RE = re.compile(r'(?:D:)?(\d{4})(\d{2})(\d{2})(\d{2})(\d{2})(\d{2})')
+
 
 class PDFExtractor(BaseExtractor):
     """Extractor for PDF documents."""
 
+    SUPPORTED_EXTENSIONS = ['pdf']
+
     def can_handle(self, file_path: Path) -> bool:
         """Check if file is a PDF."""
-        return self._get_file_extension(file_path) == 'pdf'
+        return self._get_file_extension(file_path) in self.SUPPORTED_EXTENSIONS
 
     def extract(self, file_path: Path) -> ExtractedDocument:
         """
@@ -32,16 +40,18 @@ class PDFExtractor(BaseExtractor):
         logger.info(f"Extracting PDF: {file_path}")
 
         try:
-            # Try pdfplumber first (better for complex layouts)
-            content = self._extract_with_pdfplumber(file_path)
+            # Try pdfplumber first (better for complex layouts); metadata
+            # comes from the same parse
+            content, metadata = self._extract_with_pdfplumber(file_path)
 
             # If pdfplumber fails or returns empty, try PyPDF2
             if not content or len(content.strip()) < 100:
                 logger.info("Pdfplumber extraction insufficient, trying PyPDF2")
                 content = self._extract_with_pypdf2(file_path)
 
-            # Extract metadata
-            metadata = self._extract_metadata(file_path)
+            # Only reparse for metadata if pdfplumber couldn't open the file
+            if not metadata:
+                metadata = self._extract_metadata(file_path)
 
             # Count pages and words
             page_count = metadata.get('page_count')
@@ -66,32 +76,72 @@ class PDFExtractor(BaseExtractor):
             logger.error(f"Failed to extract PDF {file_path}: {str(e)}")
             raise
 
-    def _extract_with_pdfplumber(self, file_path: Path) -> str:
-        """Extract text using pdfplumber (better for tables and layout)."""
-        content = []
+    def iter_pages(self, file_path: Path) -> Iterator[Tuple[int, str]]:
+        """
+        Extract text page by page using pdfplumber.
+
+        Only one page's layout is held at a time; pass the pages straight
+        to ChunkingStrategy.chunk_stream to chunk a large PDF without
+        building its full text.
+        Joining the page texts with blank lines gives extract()'s content.
+
+        Args:
+            file_path: Path to PDF file
+
+        Yields:
+            (page_num, text) for each page with text or tables
+        """
+        import pdfplumber
+
+        with pdfplumber.open(file_path) as pdf:
+            yield from self._iter_page_texts(pdf)
+
+    def _iter_page_texts(self, pdf: "PDF") -> Iterator[Tuple[int, str]]:
+        """Yield (page_num, text) for each non-empty page of an open PDF."""
+        for page_num, page in enumerate(pdf.pages, 1):
+            blocks = []
+
+            page_text = page.extract_text()
+            if page_text:
+                blocks.append(f"=== Page {page_num} ===\n{page_text}")
+
+            # Tables are found from ruling lines and cell borders; a page
+            # without any graphics (already parsed for the text) has none
+            if page.rects or page.lines or page.curves:
+                for table in page.extract_tables():
+                    table_text = self._format_table(table)
+                    blocks.append(f"\n[Table]\n{table_text}\n")
+
+            # pdf.pages keeps every page; drop this one's parsed layout
+            page.flush_cache()
+
+            if blocks:
+                yield page_num, "\n\n".join(blocks)
+
+    def _extract_with_pdfplumber(self, file_path: Path) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extract text and metadata using pdfplumber (better for tables and layout).
+
+        Returns:
+            (content, metadata); both empty if the file couldn't be parsed
+        """
+        import pdfplumber
 
         try:
             with pdfplumber.open(file_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_text = page.extract_text()
-                    if page_text:
-                        content.append(f"=== Page {page_num} ===\n{page_text}")
-
-                    # Extract tables if present
-                    tables = page.extract_tables()
-                    if tables:
-                        for table in tables:
-                            table_text = self._format_table(table)
-                            content.append(f"\n[Table]\n{table_text}\n")
+                metadata = self._metadata_from_info(pdf.metadata, len(pdf.pages))
+                content = "\n\n".join(text for _, text in self._iter_page_texts(pdf))
 
-            return "\n\n".join(content)
+            return content, metadata
 
         except Exception as e:
             logger.warning(f"Pdfplumber extraction failed: {str(e)}")
-            return ""
+            return "", {}
 
     def _extract_with_pypdf2(self, file_path: Path) -> str:
         """Extract text using PyPDF2 (fallback method)."""
+        import PyPDF2
+
         content = []
 
         try:
@@ -110,45 +160,51 @@ class PDFExtractor(BaseExtractor):
             raise
 
     def _extract_metadata(self, file_path: Path) -> Dict[str, Any]:
-        """Extract PDF metadata."""
+        """Extract PDF metadata with PyPDF2 (fallback method)."""
+        import PyPDF2
+
         metadata = {}
 
         try:
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
 
-                # Page count
-                metadata['page_count'] = len(pdf_reader.pages)
+                # PyPDF2 keeps the leading slash on document info keys
+                info = {key.lstrip('/'): value for key, value in (pdf_reader.metadata or {}).items()}
+                metadata = self._metadata_from_info(info, len(pdf_reader.pages))
 
-                # Document info
-                if pdf_reader.metadata:
-                    metadata['title'] = pdf_reader.metadata.get('/Title', '')
-                    metadata['author'] = pdf_reader.metadata.get('/Author', '')
-                    metadata['subject'] = pdf_reader.metadata.get('/Subject', '')
-                    metadata['creator'] = pdf_reader.metadata.get('/Creator', '')
-                    metadata['producer'] = pdf_reader.metadata.get('/Producer', '')
+        except Exception as e:
+            logger.warning(f"Failed to extract PDF metadata: {str(e)}")
 
-                    # Parse dates
-                    created = pdf_reader.metadata.get('/CreationDate')
-                    if created:
-                        metadata['created_date'] = self._parse_pdf_date(created)
+        return metadata
 
-                    modified = pdf_reader.metadata.get('/ModDate')
-                    if modified:
-                        metadata['modified_date'] = self._parse_pdf_date(modified)
+    def _metadata_from_info(self, info: Dict[str, Any], page_count: int) -> Dict[str, Any]:
+        """Build metadata from a PDF document info dict (keys without '/')."""
+        metadata = {'page_count': page_count}
 
-        except Exception as e:
-            logger.warning(f"Failed to extract PDF metadata: {str(e)}")
+        if info:
+            metadata['title'] = info.get('Title', '')
+            metadata['author'] = info.get('Author', '')
+            metadata['subject'] = info.get('Subject', '')
+            metadata['creator'] = info.get('Creator', '')
+            metadata['producer'] = info.get('Producer', '')
+
+            # Parse dates
+            created = info.get('CreationDate')
+            if created:
+                metadata['created_date'] = self._parse_pdf_date(created)
+
+            modified = info.get('ModDate')
+            if modified:
+                metadata['modified_date'] = self._parse_pdf_date(modified)
 
         return metadata
 
     def _parse_pdf_date(self, date_str: str) -> datetime:
         """Parse PDF date format (D:YYYYMMDDHHmmSS)."""
         try:
-            # Remove 'D:' prefix and timezone info
-            date_str = date_str.replace('D:', '').split('+')[0].split('-')[0]
-            # Parse the date
-            return datetime.strptime(date_str[:14], '%Y%m%d%H%M%S')
+            match = _PDF_DATE_RE.match(date_str)
+            return datetime(*map(int, match.groups())) if match else None
         except Exception:
             return None
 
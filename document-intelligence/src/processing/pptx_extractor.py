@@ -4,18 +4,22 @@ Handles PowerPoint presentations slide-by-slide.
 """
 
 from pathlib import Path
-from typing import Dict, Any
-from pptx import Presentation
+from typing import TYPE_CHECKING, Dict, Any
 from src.processing.base_extractor import BaseExtractor, ExtractedDocument
 from src.utils.logger import app_logger as logger
 
+if TYPE_CHECKING:
+    from pptx.presentation import Presentation
+
 
 class PPTXExtractor(BaseExtractor):
     """Extractor for PPTX documents."""
 
+    SUPPORTED_EXTENSIONS = ['pptx']
+
     def can_handle(self, file_path: Path) -> bool:
         """Check if file is a PPTX."""
-        return self._get_file_extension(file_path) == 'pptx'
+        return self._get_file_extension(file_path) in self.SUPPORTED_EXTENSIONS
 
     def extract(self, file_path: Path) -> ExtractedDocument:
         """
@@ -29,6 +33,8 @@ class PPTXExtractor(BaseExtractor):
         """
         logger.info(f"Extracting PPTX: {file_path}")
 
+        from pptx import Presentation
+
         try:
             prs = Presentation(file_path)
 
@@ -59,7 +65,7 @@ class PPTXExtractor(BaseExtractor):
             logger.error(f"Failed to extract PPTX {file_path}: {str(e)}")
             raise
 
-    def _extract_content(self, prs: Presentation) -> str:
+    def _extract_content(self, prs: "Presentation") -> str:
         """Extract content from all slides."""
         content = []
 
@@ -77,7 +83,9 @@ class PPTXExtractor(BaseExtractor):
                     table_text = self._extract_table(shape.table)
                     slide_text.append(f"\n[Table]\n{table_text}")
 
-            content.append("\n".join(slide_text))
+            # Slide text goes straight into the one final join rather than
+            # being joined per slide first; an empty slide still adds a line
+            content.extend(slide_text or [""])
 
             # Extract notes
             if slide.has_notes_slide:
@@ -89,15 +97,12 @@ class PPTXExtractor(BaseExtractor):
 
     def _extract_table(self, table) -> str:
         """Extract table content from a shape."""
-        table_text = []
-
-        for row in table.rows:
-            row_text = "\t".join(cell.text for cell in row.cells)
-            table_text.append(row_text)
-
-        return "\n".join(table_text)
+        return "\n".join(
+            "\t".join([cell.text for cell in row.cells])
+            for row in table.rows
+        )
 
-    def _extract_metadata(self, prs: Presentation, file_path: Path) -> Dict[str, Any]:
+    def _extract_metadata(self, prs: "Presentation", file_path: Path) -> Dict[str, Any]:
         """Extract PPTX metadata."""
         metadata = {}
 
@@ -7,7 +7,6 @@ from pathlib import Path
 from typing import Dict, Any
 import os
 from datetime import datetime
-from bs4 import BeautifulSoup
 from src.processing.base_extractor import BaseExtractor, ExtractedDocument
 from src.utils.logger import app_logger as logger
 
@@ -90,6 +89,9 @@ class TextExtractor(BaseExtractor):
 
     def _extract_html(self, html_content: str) -> str:
         """Extract text from HTML."""
+        # Imported here; most text files aren't HTML
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html_content, 'html.parser')
 
         # Remove script and style elements
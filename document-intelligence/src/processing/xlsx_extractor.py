@@ -5,7 +5,6 @@ Handles Excel spreadsheets with table awareness.
 
 from pathlib import Path
 from typing import Dict, Any
-from openpyxl import load_workbook
 from src.processing.base_extractor import BaseExtractor, ExtractedDocument
 from src.utils.logger import app_logger as logger
 
@@ -13,9 +12,11 @@ from src.utils.logger import app_logger as logger
 class XLSXExtractor(BaseExtractor):
     """Extractor for XLSX documents."""
 
+    SUPPORTED_EXTENSIONS = ['xlsx', 'xls']
+
     def can_handle(self, file_path: Path) -> bool:
         """Check if file is an XLSX."""
-        return self._get_file_extension(file_path) in ['xlsx', 'xls']
+        return self._get_file_extension(file_path) in self.SUPPORTED_EXTENSIONS
 
     def extract(self, file_path: Path) -> ExtractedDocument:
         """
@@ -29,6 +30,8 @@ class XLSXExtractor(BaseExtractor):
         """
         logger.info(f"Extracting XLSX: {file_path}")
 
+        from openpyxl import load_workbook
+
         try:
             workbook = load_workbook(file_path, data_only=True)
 
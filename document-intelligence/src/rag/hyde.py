@@ -7,7 +7,7 @@ from typing import List
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from src.search.vector_search import vector_search, SearchResult
-from src.core.embeddings import embedding_service
+from src.core.embeddings import EmbeddingService, get_embedding_service
 from config.settings import settings
 from src.utils.logger import app_logger as logger
 
@@ -22,7 +22,11 @@ class HyDERetriever:
             temperature=0.7,
             api_key=settings.openai_api_key
         )
-        self.embedding_service = embedding_service
+
+    @property
+    def embedding_service(self) -> EmbeddingService:
+        """Shared embedding service; created on first use."""
+        return get_embedding_service()
 
     def generate_hypothetical_document(self, query: str) -> str:
         """
@@ -90,38 +94,27 @@ Write the hypothetical document:"""
             # Generate hypothetical document
             hypothetical_doc = self.generate_hypothetical_document(query)
 
-            # Search using hypothetical document
-            hyde_results = vector_search.search(
-                query=hypothetical_doc,
-                top_k=top_k * 2 if use_both else top_k
-            )
-
             if use_both:
-                # Also search with original query
-                query_results = vector_search.search(
-                    query=query,
-                    top_k=top_k
-                )
-
-                # Combine and deduplicate
-                all_results = []
-                seen_ids = set()
-
-                for result in hyde_results + query_results:
-                    if result.id not in seen_ids:
-                        all_results.append(result)
-                        seen_ids.add(result.id)
-
-                # Sort by score and return top-k
-                all_results.sort(key=lambda x: x.score, reverse=True)
-                final_results = all_results[:top_k]
+                # Search with the hypothetical document (more candidates)
+                # and the original query together; results come back
+                # merged and best first
+                final_results = vector_search.search_many(
+                    queries=[hypothetical_doc, query],
+                    top_k=[top_k * 2, top_k]
+                )[:top_k]
 
                 logger.info(f"HyDE retrieval (combined) returned {len(final_results)} results")
                 return final_results
 
             else:
-                logger.info(f"HyDE retrieval returned {len(hyde_results[:top_k])} results")
-                return hyde_results[:top_k]
+                # Search using hypothetical document
+                hyde_results = vector_search.search(
+                    query=hypothetical_doc,
+                    top_k=top_k
+                )
+
+                logger.info(f"HyDE retrieval returned {len(hyde_results)} results")
+                return hyde_results
 
         except Exception as e:
             logger.error(f"HyDE retrieval failed: {str(e)}")
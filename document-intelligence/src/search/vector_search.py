@@ -3,10 +3,11 @@ Vector search implementation using Pinecone.
 Semantic similarity search with metadata filtering.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from dataclasses import dataclass
-from src.core.vector_store import vector_store
-from src.core.embeddings import embedding_service
+import numpy as np
+from src.core.vector_store import VectorStore, get_vector_store
+from src.core.embeddings import EmbeddingService, get_embedding_service
 from config.settings import settings
 from src.utils.logger import app_logger as logger
 
@@ -25,10 +26,15 @@ class SearchResult:
 class VectorSearch:
     """Vector search engine using Pinecone."""
 
-    def __init__(self):
-        """Initialize vector search."""
-        self.vector_store = vector_store
-        self.embedding_service = embedding_service
+    @property
+    def vector_store(self) -> VectorStore:
+        """Shared vector store; connects on first search."""
+        return get_vector_store()
+
+    @property
+    def embedding_service(self) -> EmbeddingService:
+        """Shared embedding service; created on first search."""
+        return get_embedding_service()
 
     def search(
         self,
@@ -96,6 +102,79 @@ class VectorSearch:
             logger.error(f"Vector search failed: {str(e)}")
             raise
 
+    def search_many(
+        self,
+        queries: List[str],
+        top_k: Union[int, List[int]] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        namespace: str = "",
+        min_score: float = None
+    ) -> List[SearchResult]:
+        """
+        Search with several query texts at once and merge the results.
+
+        The Pinecone queries run concurrently; a chunk matched by more than
+        one query keeps its best score.
+
+        Args:
+            queries: Query texts
+            top_k: Number of results per query, or one count per query
+            filter: Metadata filter
+            namespace: Optional namespace
+            min_score: Minimum similarity score threshold
+
+        Returns:
+            Deduplicated results, best first
+        """
+        top_k = top_k or settings.vector_search_top_k
+        min_score = min_score or settings.similarity_threshold
+
+        logger.info(f"Performing vector search for {len(queries)} queries, top_k={top_k}")
+
+        try:
+            query_embeddings = [self.embedding_service.generate_embedding(q) for q in queries]
+
+            ids, scores, metadatas = self.vector_store.query_many(
+                vectors=query_embeddings,
+                top_k=top_k,
+                filter=filter,
+                namespace=namespace
+            )
+
+            # Best first across every query; NaN padding sorts last and
+            # fails the threshold. The stable sort keeps earlier queries
+            # ahead on ties.
+            flat_scores = scores.ravel()
+            order = np.argsort(-flat_scores, kind='stable')
+            order = order[flat_scores[order] >= min_score]
+
+            search_results = []
+            seen_ids = set()
+
+            for flat_index in order:
+                row, col = divmod(int(flat_index), scores.shape[1])
+                match_id = ids[row, col]
+                if match_id in seen_ids:
+                    continue
+                seen_ids.add(match_id)
+
+                metadata = metadatas[row][col]
+                search_results.append(SearchResult(
+                    id=match_id,
+                    score=float(flat_scores[flat_index]),
+                    content=metadata.get('content', ''),
+                    metadata=metadata,
+                    document_id=metadata.get('document_id'),
+                    chunk_index=metadata.get('chunk_index')
+                ))
+
+            logger.info(f"Vector search returned {len(search_results)} results")
+            return search_results
+
+        except Exception as e:
+            logger.error(f"Vector search failed: {str(e)}")
+            raise
+
     def search_with_metadata_filters(
         self,
         query: str,
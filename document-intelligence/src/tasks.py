@@ -0,0 +1,76 @@
+"""
+Celery tasks for background document processing.
+Run with: celery -A src.tasks worker --loglevel=info
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+from celery import Celery
+
+from config.settings import settings
+from src.core.database import SessionLocal
+from src.core.models import Document, ProcessingStatus
+from src.processing.document_processor import document_processor
+from src.utils.logger import app_logger as logger
+
+celery_app = Celery(
+    "document_intelligence",
+    broker=settings.celery_broker_url,
+    backend=settings.celery_result_backend
+)
+
+celery_app.conf.update(
+    task_acks_late=True,  # Re-deliver if a worker dies mid-document
+    worker_prefetch_multiplier=1,  # Extraction is long-running; don't hoard jobs
+)
+
+
+@celery_app.task(name="process_document")
+def process_document(document_id: int):
+    """
+    Extract content and metadata for an uploaded document.
+
+    Args:
+        document_id: ID of the Document row to process
+    """
+    db = SessionLocal()
+    try:
+        document = db.get(Document, document_id)
+
+        if document is None:
+            logger.warning(f"Document {document_id} no longer exists; skipping")
+            return
+
+        document.status = ProcessingStatus.PROCESSING
+        document.processing_started_at = datetime.utcnow()
+        db.commit()
+
+        try:
+            extracted = document_processor.process_document(Path(document.file_path))
+
+            document.page_count = extracted.page_count
+            document.word_count = extracted.word_count
+            document.language = extracted.language
+            document.title = extracted.title
+            document.author = extracted.author
+            document.created_date = extracted.created_date
+            document.modified_date = extracted.modified_date
+            document.extra_metadata = extracted.metadata
+            document.status = ProcessingStatus.COMPLETED
+            document.processing_completed_at = datetime.utcnow()
+            db.commit()
+        except Exception as e:
+            # Saving the results can fail too; don't leave the row PROCESSING
+            db.rollback()
+            logger.error(f"Failed to process document {document_id}: {str(e)}")
+            document.status = ProcessingStatus.FAILED
+            document.processing_error = str(e)
+            document.processing_completed_at = datetime.utcnow()
+            db.commit()
+            return
+
+        logger.info(f"Document {document_id} processed successfully")
+
+    finally:
+        db.close()